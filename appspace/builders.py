@@ -1,10 +1,18 @@
 # -*- coding: utf-8 -*-
 '''appspace builder'''
 
-from appspace.spaces import patterns as apatterns
+from collections import OrderedDict
+
+from appspace.discovery import discover
+from appspace.spaces import (
+    file_patterns as afile_patterns, patterns as apatterns,
+    validate as avalidate)
 from appspace.keys import AAppspace, appifies, AppLookupError, NoAppError
 
-__all__ = ['patterns']
+__all__ = [
+    'class_patterns', 'class_validate', 'entry_patterns', 'file_patterns',
+    'patterns', 'validate',
+]
 
 
 @appifies(AAppspace)
@@ -36,6 +44,8 @@ class Appspace(object):
                 # try finding namespace
                 self.manager.namespace(label)
             except AppLookupError:
+                # failed lookups must not leave namespace swapped
+                self.manager._reset()
                 raise NoAppError(label)
             else:
                 # temporarily swap primary label
@@ -43,16 +53,47 @@ class Appspace(object):
                 return self
         else:
             # ensure current label is set back to default
-            self.manager._current = self.manager._root
+            self.manager._reset()
             return item
 
     def __call__(self, label, *args, **kw):
+        manager = self.manager
+        key = manager._current
         try:
             result = self.__getitem__(label)
-            return result(*args, **kw)
+            return manager._invoke(result, label, key, args, kw)
         except TypeError:
             return result
 
+    def compile(self):
+        '''compile appspace into proxy with labels as plain attributes'''
+        return self.manager.compile()
+
+    def select(self, pattern):
+        '''
+        things whose 'namespace.label' matches glob pattern
+
+        @param pattern: 'namespace.label' glob pattern (label only patterns
+            match in every namespace)
+        '''
+        get = self.manager.get
+        selected = OrderedDict()
+        for namespace, label in self.manager.glob(pattern):
+            try:
+                selected[namespace + '.' + label] = get(label, namespace)
+            except AppLookupError:
+                # unregistered since search
+                pass
+        return selected
+
+    def overlay(self, label):
+        '''
+        appspace whose things fall through to this appspace
+
+        @param label: label for overlay
+        '''
+        return Appspace(self.manager.overlay(label))
+
 
 def patterns(label, *args, **kw):
     '''
@@ -63,6 +104,28 @@ def patterns(label, *args, **kw):
     return Appspace(apatterns(label, *args, **kw))
 
 
+def entry_patterns(label, group, cache=None):
+    '''
+    factory for manager configured from entry point group
+
+    @param label: label for manager
+    @param group: entry point group
+    @param cache: index file path or False to always scan (default: None)
+    '''
+    return patterns(label, *discover(group, cache))
+
+
+def file_patterns(label, path, strict=False):
+    '''
+    factory for manager configured from appconf file
+
+    @param label: label for manager
+    @param path: path to appconf file of JSON records, one per line
+    @param strict: build strict manager (default: False)
+    '''
+    return Appspace(afile_patterns(label, path, strict))
+
+
 def class_patterns(clspatterns):
     '''
     factory for manager configured with class patterns
@@ -70,3 +133,21 @@ def class_patterns(clspatterns):
     @param clspatterns: class patterns
     '''
     return Appspace(clspatterns.build())
+
+
+def validate(label, *args, **kw):
+    '''
+    check import paths of appconf without importing them
+
+    @param label: label for manager
+    '''
+    return avalidate(label, *args, **kw)
+
+
+def class_validate(clspatterns, **kw):
+    '''
+    check import paths of class patterns without importing them
+
+    @param clspatterns: class patterns
+    '''
+    return clspatterns.validate(**kw)
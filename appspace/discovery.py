@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+'''appspace entry point discovery'''
+
+import os
+import sys
+import json
+import tempfile
+
+try:
+    from os import replace
+except ImportError:  # pragma: no cover
+    def replace(source, target):
+        # windows only renames onto missing files
+        try:
+            os.rename(source, target)
+        except OSError:
+            os.remove(target)
+            os.rename(source, target)
+
+__all__ = ('discover', 'index')
+
+# index format version
+VERSION = 1
+
+
+def _cachefile():
+    # default index location
+    root = os.environ.get('XDG_CACHE_HOME') or os.path.join(
+        os.path.expanduser('~'), '.cache',
+    )
+    return os.path.join(root, 'appspace', 'entrypoints.json')
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _stamp():
+    # installing or removing a distribution touches its path entry and
+    # rewriting entry points touches its metadata directory or file
+    stamp = []
+    for path in sys.path:
+        path = path or os.curdir
+        stamp.append([path, _mtime(path)])
+        try:
+            names = sorted(os.listdir(path))
+        except OSError:
+            continue
+        for name in names:
+            if name.endswith(('.dist-info', '.egg-info')):
+                info = os.path.join(path, name)
+                stamp.append([info, _mtime(info), _mtime(
+                    os.path.join(info, 'entry_points.txt')
+                )])
+    return [VERSION, sys.version] + stamp
+
+
+def _path(value):
+    # import path of entry point value ('module:attr.chain [extra]')
+    value = value.partition('[')[0].strip()
+    module, _, attr = value.partition(':')
+    module, attr = module.strip(), attr.strip()
+    if '.' in attr:
+        # attribute chains can't be told apart from modules once dotted
+        return module + ':' + attr
+    return '.'.join(p for p in (module, attr) if p)
+
+
+def _scan():
+    # group -> sorted (name, import path) of installed entry points
+    groups = {}
+    try:
+        from importlib.metadata import distributions
+    except ImportError:
+        from pkg_resources import working_set
+        for dist in working_set:
+            for group, points in dist.get_entry_map().items():
+                groups.setdefault(group, {}).update(
+                    (n, _path(str(e).partition('=')[2]))
+                    for n, e in points.items()
+                )
+    else:
+        for dist in distributions():
+            for point in dist.entry_points:
+                groups.setdefault(point.group, {}).setdefault(
+                    point.name, _path(point.value),
+                )
+    return dict((g, sorted(p.items())) for g, p in groups.items())
+
+
+def _write(cache, data):
+    # replace index atomically so readers never see partial writes
+    directory = os.path.dirname(cache)
+    try:
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        handle, temp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(handle, 'w') as stream:
+            json.dump(data, stream)
+        replace(temp, cache)
+    except (OSError, IOError):
+        # unwritable cache only costs a rescan
+        pass
+
+
+def index(cache=None):
+    '''
+    entry points of installed distributions by group
+
+    index is persisted and rebuilt only when a path entry changes
+
+    @param cache: index file path or False to always scan (default: None)
+    '''
+    if cache is False:
+        return _scan()
+    cache = cache or _cachefile()
+    stamp = _stamp()
+    try:
+        with open(cache) as stream:
+            data = json.load(stream)
+        if data['stamp'] == stamp:
+            return data['groups']
+    except (OSError, IOError, ValueError, KeyError, TypeError):
+        pass
+    groups = _scan()
+    _write(cache, dict(stamp=stamp, groups=groups))
+    return groups
+
+
+def discover(group, cache=None):
+    '''
+    appconf entries for entry point group
+
+    returns tuple of label and import path tuples for `Patterns.factory`
+
+    @param group: entry point group
+    @param cache: index file path or False to always scan (default: None)
+    '''
+    return tuple(tuple(entry) for entry in index(cache).get(group, ()))
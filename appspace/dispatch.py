@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+'''appspace type dispatched components'''
+
+from threading import Lock
+
+from stuf.six import strings
+
+from appspace.utils import lazyimport
+from appspace.keys import (
+    ADispatcher, ALazyLoad, AppLookupError, AppStore, appifies, get_apps,
+    implementedBy)
+
+__all__ = ('Dispatcher',)
+
+
+@appifies(ADispatcher)
+class Dispatcher(object):
+
+    '''component selecting implementation by positional argument types'''
+
+    __slots__ = (
+        'manager', 'key', 'label', 'default', 'arity', '_pending', '_cache',
+        '_generation', '_variants', '_lock',
+    )
+
+    def __init__(self, manager, key, label, default=None):
+        '''
+        init
+
+        @param manager: appspace manager
+        @param key: appspace key
+        @param label: appspaced thing label
+        @param default: implementation if no variant matches (default: None)
+        '''
+        self.manager = manager
+        self.key = key
+        self.label = label
+        self.default = default
+        # number of leading positional arguments dispatched on
+        self.arity = 0
+        # variants not yet registered as multi-adapters
+        self._pending = []
+        # variants live and die with this dispatcher, not in the manager
+        self._variants = AppStore()
+        # guards registering pending variants
+        self._lock = Lock()
+        self.reset()
+
+    def __call__(self, *args, **kw):
+        try:
+            if self._generation != self._variants._generation:
+                raise KeyError
+            call = self._cache[tuple(map(type, args[:self.arity]))]
+        except KeyError:
+            call = self.resolve(*args)
+        return call(*args, **kw)
+
+    def __repr__(self):
+        return 'dispatcher for {label}'.format(label=self.label)
+
+    def add(self, types, thing):
+        '''
+        add implementation for positional argument types
+
+        @param types: type, import path to type, or sequence of them
+        @param thing: implementation or import path to implementation
+        '''
+        if not isinstance(types, (tuple, list)):
+            types = (types,)
+        with self._lock:
+            self.arity = max(self.arity, len(types))
+            self._pending.append((tuple(types), thing))
+        self.reset()
+
+    def reset(self):
+        '''forget cached implementations'''
+        self._cache = {}
+        self._generation = None
+
+    def resolve(self, *args):
+        '''
+        find and cache implementation for argument types
+
+        @param *args: positional arguments
+        '''
+        manager, key, label = self.manager, self.key, self.label
+        variants = self._variants
+        # register pending variants as multi-adapters before any lookup
+        with self._lock:
+            pending, self._pending = self._pending, []
+            for types, thing in pending:
+                variants.register(
+                    [implementedBy(lazyimport(t)) for t in types], key, label,
+                    thing,
+                )
+        if self._generation != variants._generation:
+            self._cache = {}
+            self._generation = variants._generation
+        call = None
+        for arity in range(min(self.arity, len(args)), 0, -1):
+            call = variants.lookup(
+                [get_apps(a) for a in args[:arity]], key, label,
+            )
+            if call is not None:
+                break
+        if call is None:
+            call = self.default
+            if call is None:
+                raise AppLookupError(args, label)
+        if isinstance(call, strings) or manager.keyed(ALazyLoad, call):
+            call = lazyimport(getattr(call, 'path', call))
+        self._cache[tuple(map(type, args[:self.arity]))] = call
+        return call
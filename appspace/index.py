@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+'''appspace label indexes'''
+
+from bisect import bisect_left
+from fnmatch import fnmatchcase
+from itertools import islice, takewhile
+
+__all__ = ('LabelIndex',)
+
+# wildcard characters in glob patterns
+WILDCARDS = '*?['
+# separates label from namespace in the label ordered index
+NUL = '\0'
+
+
+def _literal(pattern):
+    # part of glob pattern before its first wildcard
+    for n, char in enumerate(pattern):
+        if char in WILDCARDS:
+            return pattern[:n]
+    return pattern
+
+
+def _scan(entries, prefix):
+    # sorted entries starting with prefix
+    start = bisect_left(entries, prefix)
+    return takewhile(
+        lambda x: x.startswith(prefix), islice(entries, start, None),
+    )
+
+
+class LabelIndex(object):
+
+    '''
+    sorted indexes of namespace and thing labels
+
+    indexes change in place, so searches and changes must not overlap
+    '''
+
+    __slots__ = ('dotted', 'labels')
+
+    # changes merged into index by re-sorting instead of inserting
+    merge = 32
+
+    def __init__(self, dotted=(), labels=()):
+        '''
+        init
+
+        @param dotted: sorted 'namespace.label' entries (default: ())
+        @param labels: sorted 'label\\0namespace' entries (default: ())
+        '''
+        self.dotted = list(dotted)
+        self.labels = list(labels)
+
+    @classmethod
+    def build(cls, pairs):
+        '''
+        build index
+
+        @param pairs: iterable of namespace and label pairs
+        '''
+        pairs = list(pairs)
+        return cls(
+            sorted(n + '.' + l for n, l in pairs),
+            sorted(l + NUL + n for n, l in pairs),
+        )
+
+    def update(self, added, removed):
+        '''
+        add and remove labels in place
+
+        @param added: namespace and label pairs added
+        @param removed: namespace and label pairs removed
+        '''
+        if len(added) + len(removed) > self.merge:
+            pairs = set(
+                tuple(d.split('.', 1)) for d in self.dotted
+            ).union(added).difference(removed)
+            self.dotted = sorted(n + '.' + l for n, l in pairs)
+            self.labels = sorted(l + NUL + n for n, l in pairs)
+            return
+        for namespace, label in removed:
+            self._remove(namespace, label)
+        for namespace, label in added:
+            self._add(namespace, label)
+
+    def _add(self, namespace, label):
+        for entries, entry in (
+            (self.dotted, namespace + '.' + label),
+            (self.labels, label + NUL + namespace),
+        ):
+            at = bisect_left(entries, entry)
+            if at == len(entries) or entries[at] != entry:
+                entries.insert(at, entry)
+
+    def _remove(self, namespace, label):
+        for entries, entry in (
+            (self.dotted, namespace + '.' + label),
+            (self.labels, label + NUL + namespace),
+        ):
+            at = bisect_left(entries, entry)
+            if at < len(entries) and entries[at] == entry:
+                del entries[at]
+
+    def glob(self, pattern):
+        '''
+        namespace and label pairs matching 'namespace.label' glob pattern
+
+        patterns without a namespace match labels in every namespace
+
+        @param pattern: glob pattern
+        '''
+        namespace, dot, label = pattern.partition('.')
+        if not dot:
+            namespace, label = '*', namespace
+        if _literal(namespace) == namespace:
+            # literal namespace narrows search to its labels
+            matches = (
+                tuple(d.split('.', 1)) for d in _scan(
+                    self.dotted, namespace + '.' + _literal(label),
+                )
+            )
+        else:
+            matches = (
+                tuple(reversed(l.split(NUL, 1)))
+                for l in _scan(self.labels, _literal(label))
+            )
+        return sorted(
+            (n, l) for n, l in matches
+            if fnmatchcase(n, namespace) and fnmatchcase(l, label)
+        )
+
+    def prefix(self, prefix):
+        '''
+        namespace and label pairs whose label starts with prefix
+
+        @param prefix: label prefix
+        '''
+        return sorted(
+            tuple(reversed(l.split(NUL, 1)))
+            for l in _scan(self.labels, prefix)
+        )
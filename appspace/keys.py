@@ -5,8 +5,10 @@
 # pylint: disable-msg=f0401
 from zope.interface.interfaces import ComponentLookupError
 from zope.interface.interface import InterfaceClass, Attribute
-from zope.interface import implementer, directlyProvides, providedBy
-from zope.interface.adapter import AdapterRegistry, VerifyingAdapterRegistry
+from zope.interface import (
+    implementer, implementedBy, directlyProvides, providedBy)
+from zope.interface.adapter import (
+    AdapterRegistry, BaseAdapterRegistry, VerifyingAdapterRegistry)
 # pylint: enable-msg=f0401
 
 AppStore = AdapterRegistry
@@ -40,7 +42,19 @@ class AAppspace(AppspaceKey):
 
     def __getitem__(label):
         '''get item'''
-        
+
+# pylint: disable-msg=e0211
+    def compile():
+        '''compile appspace into proxy'''
+# pylint: enable-msg=e0211
+
+    def select(pattern):
+        '''
+        things matching glob pattern
+
+        @param pattern: 'namespace.label' glob pattern
+        '''
+
 
 class ABranch(AppspaceKey):
 
@@ -59,6 +73,33 @@ class ALazyLoad(AApp):
     path = Attribute('import path')
 
 
+class ADispatcher(AApp):
+
+    '''type dispatched app key'''
+
+    default = Attribute('implementation if no variant matches')
+
+    def add(types, thing):
+        '''
+        add implementation for positional argument types
+
+        @param types: type, import path to type, or sequence of them
+        @param thing: implementation
+        '''
+
+
+class ALifetime(AApp):
+
+    '''component lifetime key'''
+
+    path = Attribute('import path or factory')
+
+# pylint: disable-msg=e0211
+    def get():
+        '''get component instance for this lifetime'''
+# pylint: enable-msg=e0211
+
+
 class AManager(AppspaceKey):
 
     '''appspace key'''
@@ -79,6 +120,21 @@ class AManager(AppspaceKey):
         @param key: appspace key (default: False)
         '''
 
+    def get_path(path, key=False):
+        '''
+        get thing at dotted path
+
+        @param path: dotted path
+        @param key: appspace key label to start from (default: False)
+        '''
+
+    def glob(pattern):
+        '''
+        namespace and label of things matching glob pattern
+
+        @param pattern: 'namespace.label' glob pattern
+        '''
+
     def load(label, key, module):
         '''
         import thing into appspace
@@ -88,6 +144,28 @@ class AManager(AppspaceKey):
         @param module: module path
         '''
         
+    def compile(label=False):
+        '''
+        compile namespace into proxy
+
+        @param label: appspace key label (default: False)
+        '''
+
+    def resolver(path, key=False):
+        '''
+        callable getting thing at dotted path
+
+        @param path: dotted path
+        @param key: appspace key label to start from (default: False)
+        '''
+
+    def prefix(prefix):
+        '''
+        namespace and label of things whose label starts with prefix
+
+        @param prefix: label prefix
+        '''
+
     def namespace(label):
         '''
         fetch key
@@ -95,6 +173,13 @@ class AManager(AppspaceKey):
         @param label: appspace key label
         '''
         
+    def overlay(label):
+        '''
+        create child manager whose lookups fall through to this manager
+
+        @param label: label for overlay's internal namespace
+        '''
+
     def partial(call, key=False, *args, **kw):
         '''
         partialize callable or appspaced application with any passed parameters
@@ -103,13 +188,14 @@ class AManager(AppspaceKey):
         @param key: appspace key label (default: False)
         '''
         
-    def set(label=False, thing=False, key=False):
+    def set(label=False, thing=False, key=False, **options):
         '''
         add thing to appspace
 
         @param label: new appspace thing label (default: False)
         @param key: key label (default: False)
         @param thing: new appspace thing (default: False)
+        @param **options: registration options
         '''
         
     def slugify(value):
@@ -138,3 +224,13 @@ class NoAppspaceError(Exception):
 class NoAppError(Exception):
 
     '''mo application found exception'''
+
+
+class PoolError(Exception):
+
+    '''pool exhausted or misused exception'''
+
+
+class RemoteError(Exception):
+
+    '''remote app exception that could not be sent back'''
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+'''appspace component lifetimes'''
+
+import threading
+from time import time
+from collections import deque
+from contextlib import contextmanager
+
+from stuf.six import strings
+
+from appspace.utils import ContextMap, lazyimport
+from appspace.keys import ALifetime, ConfigurationError, PoolError, appifies
+
+__all__ = (
+    'Context', 'Pool', 'Singleton', 'Thread', 'Transient', 'lifetime',
+)
+
+# instances of context lifetimes in each execution context
+_instances = ContextMap('appspace.lifetimes')
+
+
+@appifies(ALifetime)
+class Lifetime(object):
+
+    '''base component lifetime'''
+
+    __slots__ = ('path', '_factory', '__weakref__')
+
+    name = 'lifetime'
+
+    def __init__(self, path):
+        '''
+        init
+
+        @param path: import path to or component factory
+        '''
+        self.path = path
+        self._factory = None
+
+    def __repr__(self):
+        return '{name} of {path}'.format(name=self.name, path=self.path)
+
+    @property
+    def factory(self):
+        '''component factory'''
+        factory = self._factory
+        if factory is None:
+            factory = self._factory = lazyimport(self.path)
+        return factory
+
+    def build(self):
+        '''build new component instance'''
+        return self.factory()
+
+    def get(self):
+        '''get component instance for this lifetime (default: new one)'''
+        return self.build()
+
+
+class Transient(Lifetime):
+
+    '''new component instance on every lookup'''
+
+    __slots__ = ()
+
+    name = 'transient'
+
+
+class Singleton(Lifetime):
+
+    '''one component instance per registration'''
+
+    __slots__ = ('_instance', '_lock')
+
+    name = 'singleton'
+
+    def __init__(self, path):
+        super(Singleton, self).__init__(path)
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                instance = self._instance
+                if instance is None:
+                    instance = self._instance = self.build()
+        return instance
+
+
+class Thread(Lifetime):
+
+    '''one component instance per thread'''
+
+    __slots__ = ('_local',)
+
+    name = 'thread'
+
+    def __init__(self, path):
+        super(Thread, self).__init__(path)
+        self._local = threading.local()
+
+    def get(self):
+        try:
+            return self._local.instance
+        except AttributeError:
+            instance = self._local.instance = self.build()
+            return instance
+
+
+class Context(Lifetime):
+
+    '''one component instance per execution context (contextvars)'''
+
+    __slots__ = ()
+
+    name = 'context'
+
+    def get(self):
+        instance = _instances.get(self)
+        if instance is None:
+            instance = self.build()
+            _instances.set(self, instance)
+        return instance
+
+
+class Pool(Lifetime):
+
+    '''bounded pool of reusable component instances'''
+
+    __slots__ = (
+        'size', 'idle', 'close', '_free', '_count', '_leased', '_cond',
+    )
+
+    name = 'pool'
+
+    def __init__(self, path, size=8, idle=None, close=None):
+        '''
+        init
+
+        @param path: import path to or component factory
+        @param size: maximum number of instances (default: 8)
+        @param idle: seconds before idle instance is evicted (default: None)
+        @param close: name of method called on evicted instance
+            (default: None)
+        '''
+        super(Pool, self).__init__(path)
+        self.size = size
+        self.idle = idle
+        self.close = close
+        # idle instances and the time they were checked in
+        self._free = deque()
+        # number of live instances
+        self._count = 0
+        # id -> instance of checked out instances
+        self._leased = {}
+        self._cond = threading.Condition(threading.Lock())
+
+    def _dispose(self, instance):
+        if self.close is not None:
+            getattr(instance, self.close)()
+
+    def _evict(self):
+        # drop instances idle for too long (oldest are leftmost)
+        evicted = []
+        if self.idle is not None:
+            free = self._free
+            expires = time() - self.idle
+            while free and free[0][1] < expires:
+                evicted.append(free.popleft()[0])
+            self._count -= len(evicted)
+        return evicted
+
+    def get(self):
+        return self
+
+    def _release(self, instance):
+        # stop tracking checked out instance (call with lock held)
+        if self._leased.pop(id(instance), None) is not instance:
+            raise PoolError('{0!r} is not checked out of {1}'.format(
+                instance, self,
+            ))
+
+    def discard(self, instance):
+        '''
+        drop broken instance checked out of pool
+
+        @param instance: instance checked out of pool
+        '''
+        with self._cond:
+            self._release(instance)
+            self._count -= 1
+            self._cond.notify()
+        self._dispose(instance)
+
+    def checkin(self, instance):
+        '''
+        return instance to pool
+
+        @param instance: instance checked out of pool
+        '''
+        with self._cond:
+            self._release(instance)
+            self._free.append((instance, time()))
+            evicted = self._evict()
+            self._cond.notify()
+        for instance in evicted:
+            self._dispose(instance)
+
+    def checkout(self, timeout=None):
+        '''
+        take instance out of pool
+
+        @param timeout: seconds to wait for free instance (default: None)
+        '''
+        deadline = None if timeout is None else time() + timeout
+        with self._cond:
+            evicted = self._evict()
+            while not self._free and self._count >= self.size:
+                # wait only for what is left of timeout after wakeups
+                left = None if deadline is None else deadline - time()
+                if (left is not None and left <= 0) or not self._cond.wait(
+                    left
+                ):
+                    raise PoolError(self)
+            if self._free:
+                # most recently used instance is warmest
+                instance = self._free.pop()[0]
+                self._leased[id(instance)] = instance
+            else:
+                instance = None
+                self._count += 1
+        for old in evicted:
+            self._dispose(old)
+        if instance is None:
+            try:
+                instance = self.build()
+            except Exception:
+                with self._cond:
+                    self._count -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._leased[id(instance)] = instance
+        return instance
+
+    def clear(self):
+        '''drop all idle instances'''
+        with self._cond:
+            free, self._free = self._free, deque()
+            self._count -= len(free)
+            self._cond.notify_all()
+        for instance, _ in free:
+            self._dispose(instance)
+
+    @contextmanager
+    def lease(self, timeout=None):
+        '''
+        check out instance for the duration of a with block
+
+        @param timeout: seconds to wait for free instance (default: None)
+        '''
+        instance = self.checkout(timeout)
+        try:
+            yield instance
+        finally:
+            self.checkin(instance)
+
+
+LIFETIMES = dict(
+    (cls.name, cls) for cls in (Transient, Singleton, Thread, Context, Pool)
+)
+
+
+def lifetime(name, path, **options):
+    '''
+    wrap component in lifetime
+
+    @param name: lifetime name or class
+    @param path: import path to or component factory
+    @param **options: lifetime options (e.g. pool `size`)
+    '''
+    try:
+        cls = LIFETIMES[name] if isinstance(name, strings) else name
+    except KeyError:
+        raise ConfigurationError('unknown lifetime {0}'.format(name))
+    try:
+        return cls(path, **options)
+    except TypeError:
+        raise ConfigurationError(
+            'invalid options {0} for {1} lifetime'.format(options, name)
+        )
@@ -2,12 +2,29 @@
 '''appspace management'''
 
 import re
+import gc
 import unicodedata
+from functools import partial
+from collections import OrderedDict
+from contextlib import contextmanager
 
-from stuf.six import u
+from stuf.six import u, strings
 
-from appspace.registry import Registry, StrictRegistry
-from appspace.keys import AManager, ANamespace, AppLookupError, appifies
+try:
+    import tracemalloc
+except ImportError:  # pragma: no cover
+    tracemalloc = None
+
+from appspace.memo import memo
+from appspace.memory import Footprint, retained, shared
+from appspace.utils import lazyimports
+from appspace.dispatch import Dispatcher
+from appspace.proxies import compiled, generate
+from appspace.registry import (
+    Component, Registry, StrictRegistry, _currents, _scopes)
+from appspace.keys import (
+    AManager, ANamespace, AAppspace, ADispatcher, ALazyLoad, ALifetime,
+    AppLookupError, ConfigurationError, appifies)
 
 __all__ = ('Manager', 'StrictManager')
 
@@ -26,7 +43,76 @@ class RootMixin(object):
         @param label: appspaced call
         @param key: key label (default: False)
         '''
-        return self.get(label, key)(*args, **kw)
+        return self._invoke(self.get(label, key), label, key, args, kw)
+
+    def _invoke(self, call, label, key, args, kw):
+        # route calls to pure components through their result cache
+        memo = self._memo(self._memokey(key, label))
+        return call(*args, **kw) if memo is None else memo(call, args, kw)
+
+    def _cached(self, label, key):
+        memo = self._memo(self._memokey(key, label))
+        if memo is None:
+            raise KeyError(label)
+        return memo
+
+    def _memo(self, memokey):
+        # result cache of component, falling through to base managers
+        try:
+            return self._memos[memokey]
+        except KeyError:
+            for base in self.__bases__:
+                if isinstance(base, RootMixin):
+                    return base._memo(memokey)
+
+    def _memokey(self, key, label):
+        # root namespace label differs between overlays and their base
+        return (None if not key or key == self._root else key, label)
+
+    def cache_clear(self, label, key=False):
+        '''
+        clear result cache of pure appspaced call
+
+        @param label: appspaced call
+        @param key: key label (default: False)
+        '''
+        self._cached(label, key).clear()
+
+    def cache_info(self, label, key=False):
+        '''
+        result cache statistics of pure appspaced call
+
+        @param label: appspaced call
+        @param key: key label (default: False)
+        '''
+        return self._cached(label, key).info()
+
+    def compile(self, label=False):
+        '''
+        compile namespace into proxy whose labels are plain attributes
+
+        proxies are regenerated on first access after a registry change
+
+        @param label: `appspace` key label (default: False)
+        '''
+        return compiled(self, self._root if label is False else label)
+
+    def drop_namespace(self, label):
+        '''
+        remove namespace and every thing in it without loading lazy things
+
+        things of base managers stay visible through overlays
+
+        @param label: `appspace` key label
+        '''
+        if label == self._root:
+            raise ConfigurationError('root namespace cannot be dropped')
+        key = self.namespace(label)
+        with self.batch():
+            labels = [name for _, name, _ in self.registrations(key)]
+            self.unregister_many(labels, label)
+            self.ez_unregister(ANamespace, label)
+            self._proxies.pop(label, None)
 
     def get(self, label, key=False):
         '''
@@ -37,35 +123,393 @@ class RootMixin(object):
         '''
         # use internal key if key label == internal key
         key = self._key if key == self._root else self.namespace(key)
-        app = self.lookup1(key, key, label)
+        app = self._find(key, label)
         if app is None:
             raise AppLookupError(app, label)
         return self._unlazy(label, key, app)
 
+    def get_path(self, path, key=False):
+        '''
+        get thing at dotted path through namespaces, branches, and
+        attributes
+
+        resolved paths are cached until a traversed manager changes
+
+        @param path: dotted path (e.g. 'namespace.branch.label.attribute')
+        @param key: `appspace` key label to start from (default: False)
+        '''
+        routes = self._routes
+        try:
+            route = routes[(key, path)]
+            for manager, generation in route[2]:
+                if manager._generation != generation:
+                    raise KeyError(path)
+        except KeyError:
+            route = routes[(key, path)] = self._route(path, key)
+        thing, live, _, _ = route
+        return thing.get() if live else thing
+
+    def resolver(self, path, key=False):
+        '''
+        callable getting thing at dotted path without lookups until a
+        traversed manager changes
+
+        @param path: dotted path (e.g. 'namespace.branch.label.attribute')
+        @param key: `appspace` key label to start from (default: False)
+        '''
+        route = [self._route(path, key)]
+
+        def resolve():
+            thing, live, stamps, _ = route[0]
+            for manager, generation in stamps:
+                if manager._generation != generation:
+                    thing, live, _, _ = route[0] = self._route(path, key)
+                    break
+            return thing.get() if live else thing
+        return resolve
+
+    def _route(self, path, key=False):
+        # resolve dotted path into thing, whether it is a lifetime,
+        # generation of each traversed manager, and result cache of thing
+        manager = self
+        namespace = self._root if key is False else key
+        stamps = [(self, self._generation)]
+        keyed = self.keyed
+        thing = memokey = None
+        live = False
+        for label in path.split('.'):
+            if thing is not None:
+                if live:
+                    # instances of lifetimes inside paths are not cached
+                    thing, live = thing.get(), False
+                    stamps = [(self, None)]
+                if not keyed(AAppspace, thing):
+                    try:
+                        thing = getattr(thing, label)
+                    except AttributeError:
+                        raise AppLookupError(thing, path)
+                    # attributes of things have no result caches
+                    memokey = None
+                    continue
+                # enter included branch appspace
+                manager = thing.manager
+                namespace = manager._root
+                stamps.append((manager, manager._generation))
+                thing = None
+            nskey = manager._key if namespace == manager._root else (
+                manager.namespace(namespace)
+            )
+            found = manager._find(nskey, label)
+            if found is None:
+                # enter namespace
+                manager.namespace(label)
+                namespace = label
+                continue
+            # result cache is kept by manager and namespace of thing
+            memokey = manager._memokey(namespace, label)
+            if keyed(ALifetime, found):
+                thing, live = found, True
+            else:
+                thing = manager._unlazy(label, nskey, found)
+        if thing is None:
+            thing = manager.compile(namespace)
+        memo = None if memokey is None else manager._memo(memokey)
+        return thing, live, tuple(stamps), memo
+
+    def glob(self, pattern):
+        '''
+        namespace and label of things matching glob pattern
+
+        @param pattern: 'namespace.label' glob pattern (label only patterns
+            match in every namespace)
+        '''
+        return self._search('glob', pattern)
+
+    def prefix(self, prefix):
+        '''
+        namespace and label of things whose label starts with prefix
+
+        @param prefix: label prefix
+        '''
+        return self._search('prefix', prefix)
+
+    def _search(self, how, query):
+        # search label indexes of this and base managers
+        matches = set()
+        for registry in self.ro:
+            if isinstance(registry, RootMixin):
+                matches.update(registry._searched(how, query))
+        return sorted(matches)
+
+    def memory_report(self, sort='retained'):
+        '''
+        memory attributed to each thing, grouped by namespace
+
+        namespaces are ordered by their total and things by the sort field,
+        largest first
+
+        @param sort: Footprint field to sort by (default: 'retained')
+        '''
+        footprints = self._footprints
+        keyed = self.keyed
+        names = self._namespaces()
+        # module globals are shared by every thing
+        ids = shared()
+        report = {}
+        for key, label, thing in self.registrations():
+            namespace = names.get(key)
+            if namespace is None:
+                continue
+            lazy = keyed(ALazyLoad, thing)
+            report.setdefault(namespace, []).append(Footprint(
+                namespace,
+                label,
+                lazy,
+                footprints.get((key, label)),
+                0 if lazy else retained(thing, ids=ids),
+            ))
+        field = Footprint._fields.index(sort)
+        order = lambda x: x[field] or 0
+        total = lambda x: sum(order(f) for f in x[1])
+        return OrderedDict(
+            (n, sorted(f, key=order, reverse=True))
+            for n, f in sorted(report.items(), key=total, reverse=True)
+        )
+
+    def _namespaces(self):
+        # labels of namespace keys
+        names = dict(
+            (k, l) for l, k in self.lookupAll([ANamespace], ANamespace)
+        )
+        names[self._key] = self._root
+        return names
+
     def namespace(self, label):
         '''
         fetch key
 
         @param label: `appspace` key label
         '''
-        this = self.lookup1(ANamespace, ANamespace, label)
+        this = self._find(ANamespace, label)
         if this is None:
             raise AppLookupError(this, label)
         return this
 
-    def set(self, thing=False, label=False, key=False):
+    def overlay(self, label):
+        '''
+        create child manager whose lookups fall through to this manager
+
+        things set on the overlay are only visible through the overlay
+
+        @param label: label for overlay's internal namespace
+        '''
+        return type(self)(label, self._key, (self,))
+
+    def partial(self, call, key=False, *args, **kw):
+        '''
+        partialize callable or appspaced call with any passed parameters
+
+        appspaced calls are resolved once and re-resolved only after a
+        manager traversed to reach them changes
+
+        @param call: callable or appspaced call label or dotted path
+        @param key: `appspace` key label (default: False)
+        '''
+        if not isinstance(call, strings):
+            return partial(call, *args, **kw)
+        bound = [None]
+
+        def bind():
+            thing, live, stamps, memo = self._route(call, key)
+            if live:
+                target = lambda *a, **k: thing.get()(*(args + a), **dict(
+                    kw, **k
+                ))
+            elif memo is not None:
+                target = lambda *a, **k: memo(thing, args + a, dict(kw, **k))
+            else:
+                target = partial(thing, *args, **kw)
+            bound[0] = (stamps, target)
+            return target
+
+        def call_bound(*more, **morekw):
+            stamps, target = bound[0]
+            for manager, generation in stamps:
+                if manager._generation != generation:
+                    target = bind()
+                    break
+            return target(*more, **morekw)
+        bind()
+        return call_bound
+
+    def preload(self, label=False):
+        '''
+        resolve lazily loaded things with one import per module
+
+        @param label: `appspace` key label (default: False for all)
+        '''
+        key = None if label is False else (
+            self._key if label == self._root else self.namespace(label)
+        )
+        keyed = self.keyed
+        lazy = []
+        for required, name, thing in self.registrations(key):
+            if keyed(ALazyLoad, thing):
+                path = thing.path
+                # branch includes
+                if isinstance(path, tuple):
+                    path = path[-1]
+                lazy.append((required, name, path, thing))
+        if self._tracing:
+            # trace memory of each thing
+            for required, name, path, thing in lazy:
+                self.load(name, required, path, thing)
+            return
+        loaded = lazyimports(p for _, _, p, _ in lazy)
+        register = self.register
+        with self.batch():
+            for required, name, path, _ in lazy:
+                register([required], required, name, loaded[path])
+
+    def prepare_for_fork(self, freeze=True):
+        '''
+        ready manager for sharing memory with forked worker processes
+
+        resolves lazy things, compacts the registry, warms lookup caches,
+        and moves all objects into the garbage collector's permanent
+        generation so children do not write to their pages
+
+        @param freeze: freeze garbage collection of objects (default: True)
+        '''
+        self.preload()
+        keyed = self.keyed
+        for _, _, thing in self.registrations():
+            if keyed(AAppspace, thing):
+                thing.manager.prepare_for_fork(False)
+        self.compact()
+        # warm lookup caches
+        lookup1 = self.lookup1
+        for required, name, _ in self.registrations():
+            lookup1(required, required, name)
+        for label, proxy in list(self._proxies.items()):
+            try:
+                proxy.__class__ = generate(self, label)
+            except AppLookupError:
+                pass
+        if freeze:
+            gc.collect()
+            # python >= 3.7
+            if hasattr(gc, 'freeze'):
+                gc.freeze()
+
+    def set(self, thing=False, label=False, key=False, **options):
         '''
         add thing to `appspace`
 
         @param thing: new `appspace` thing (default: False)
         @param label: new `appspace` thing label (default: False)
         @param key: key label (default: False)
+        @param **options: registration options (e.g. `lifetime`, `cache`,
+            `dispatch`)
         '''
-        thing = self._lazy(thing)
+        if isinstance(thing, Component):
+            options = dict(thing.options, **options)
+            thing = thing.thing
+        cache = options.pop('cache', None)
+        dispatch = options.pop('dispatch', None)
+        thing = self._configure(thing, options)
+        label = self.safename(label)
+        memokey = self._memokey(key, label)
         key = self.namespace(key) if key else self._key
-        self.register([key], key, self.safename(label), thing)
+        # read, modify, and write registration as one change
+        with self._writer:
+            current = self.registered([key], key, label)
+            dispatched = dispatch is not None or self.keyed(
+                ADispatcher, current,
+            )
+            if dispatched and (
+                self.keyed(ALifetime, thing) or self.keyed(ALifetime, current)
+            ):
+                # dispatchers call implementations, not lifetimes
+                raise ConfigurationError(
+                    'dispatched component {0} cannot have a lifetime'.format(
+                        label,
+                    )
+                )
+            if self.keyed(ADispatcher, current):
+                # keep implementations dispatched by type
+                if dispatch is None:
+                    current.default = thing
+                    current.reset()
+                else:
+                    current.add(dispatch, thing)
+            elif dispatch is not None:
+                dispatcher = Dispatcher(self, key, label, current)
+                dispatcher.add(dispatch, thing)
+                self.register([key], key, label, dispatcher)
+            else:
+                self.register([key], key, label, thing)
+            # (re)registration drops any cached results
+            if cache:
+                self._memos[memokey] = memo(cache)
+            elif self.__bases__:
+                # hide result caches of base managers
+                self._memos[memokey] = None
+            else:
+                self._memos.pop(memokey, None)
         return thing
 
+    def trace_memory(self, trace=True):
+        '''
+        trace memory allocated while lazily loading things
+
+        starts `tracemalloc` if it is not already tracing
+
+        @param trace: start or stop tracing (default: True)
+        '''
+        if trace and tracemalloc is None:  # pragma: no cover
+            raise ConfigurationError('memory tracing needs python 3.4+')
+        if trace and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._tracing = trace
+
+    def unregister_many(self, labels, key=False):
+        '''
+        remove things without loading lazy things
+
+        registry changes are published and notified once
+
+        @param labels: appspaced thing labels
+        @param key: key label (default: False)
+        '''
+        memos = self._memos
+        memokey = self._memokey
+        nskey = self.namespace(key) if key else self._key
+        unregister = self.ez_unregister
+        with self.batch():
+            for label in labels:
+                unregister(nskey, label)
+                memos.pop(memokey(key, label), None)
+
+    @contextmanager
+    def using(self, label):
+        '''
+        make namespace current namespace within a with block for this
+        execution context only
+
+        @param label: `appspace` key label
+        '''
+        # raise lookup error for unknown namespaces
+        self.namespace(label)
+        scope, current = _scopes.get(self), _currents.get(self)
+        _scopes.set(self, label)
+        _currents.set(self, None)
+        try:
+            yield self
+        finally:
+            _currents.set(self, current)
+            _scopes.set(self, scope)
+
     @classmethod
     def slugify(cls, value):
         '''
@@ -81,7 +525,11 @@ class Manager(RootMixin, Registry):
 
     '''state manager'''
 
-    __slots__ = ('_current', '_root', '_key', '_first', '_second')
+    __slots__ = (
+        '_root', '_key', '_fanout', '_proxies', '_memos', '_footprints',
+        '_tracing', '_snapshot', '_version', '_writer', '_pending', '_batcher',
+        '_deferred', '_loading', '_index', '_routes', '_first', '_second',
+    )
 
 
 @appifies(AManager)
@@ -89,7 +537,11 @@ class StrictManager(RootMixin, StrictRegistry):
 
     '''strict manager'''
 
-    __slots__ = ('_current', '_root', '_key', '_first', '_second')
+    __slots__ = (
+        '_root', '_key', '_fanout', '_proxies', '_memos', '_footprints',
+        '_tracing', '_snapshot', '_version', '_writer', '_pending', '_batcher',
+        '_deferred', '_loading', '_index', '_routes', '_first', '_second',
+    )
 
 
 keyed = Manager.keyed
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+'''appspace result memoization'''
+
+import threading
+from time import time
+from collections import OrderedDict, namedtuple
+
+from appspace.keys import ConfigurationError
+
+__all__ = ('CacheInfo', 'Memo', 'memo')
+
+CacheInfo = namedtuple('CacheInfo', 'hits misses maxsize currsize')
+# separates positional from keyword arguments in cache keys
+_kwd_mark = (object(),)
+
+
+class Memo(object):
+
+    '''bounded least recently used result cache with optional expiry'''
+
+    __slots__ = ('maxsize', 'ttl', 'hits', 'misses', '_results', '_lock')
+
+    def __init__(self, maxsize=128, ttl=None):
+        '''
+        init
+
+        @param maxsize: maximum number of cached results (default: 128)
+        @param ttl: seconds before cached result expires (default: None)
+        '''
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = self.misses = 0
+        # key -> (result, expiry time)
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, call, args, kw):
+        '''
+        call with cached result for arguments
+
+        @param call: pure callable
+        @param args: positional arguments
+        @param kw: keyword arguments
+        '''
+        try:
+            key = args + _kwd_mark + tuple(sorted(kw.items())) if kw else (
+                args
+            )
+            hash(key)
+        except TypeError:
+            # unhashable arguments are never cached
+            return call(*args, **kw)
+        results = self._results
+        with self._lock:
+            try:
+                result, expires = results[key]
+            except KeyError:
+                pass
+            else:
+                if expires is None or expires > time():
+                    # python < 3.2 OrderedDict can't move_to_end
+                    results[key] = results.pop(key)
+                    self.hits += 1
+                    return result
+                del results[key]
+            self.misses += 1
+        result = call(*args, **kw)
+        ttl = self.ttl
+        with self._lock:
+            results[key] = (result, None if ttl is None else time() + ttl)
+            if len(results) > self.maxsize:
+                results.popitem(last=False)
+        return result
+
+    def clear(self):
+        '''clear cached results and statistics'''
+        with self._lock:
+            self._results.clear()
+            self.hits = self.misses = 0
+
+    def info(self):
+        '''cache statistics'''
+        return CacheInfo(
+            self.hits, self.misses, self.maxsize, len(self._results),
+        )
+
+
+def memo(option):
+    '''
+    result cache for `cache` registration option
+
+    @param option: maximum size, True, or dict of `maxsize` and `ttl`
+    '''
+    if option is True:
+        return Memo()
+    if isinstance(option, dict):
+        try:
+            return Memo(**option)
+        except TypeError:
+            raise ConfigurationError('invalid cache options {0}'.format(option))
+    if isinstance(option, int):
+        return Memo(option)
+    raise ConfigurationError('invalid cache option {0}'.format(option))
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+'''appspace memory attribution'''
+
+import sys
+import gc
+from types import ModuleType
+from collections import namedtuple
+
+__all__ = ('Footprint', 'retained', 'shared')
+
+# memory attributed to a component
+Footprint = namedtuple('Footprint', 'namespace label lazy loaded retained')
+
+
+def shared():
+    '''ids of module globals, which are shared and not counted'''
+    return set(
+        id(vars(m)) for m in list(sys.modules.values())
+        if isinstance(m, ModuleType)
+    )
+
+
+def retained(thing, limit=100000, ids=None):
+    '''
+    approximate bytes retained by an object and what only it refers to
+
+    modules, classes, and module globals are shared and not counted
+
+    @param thing: object
+    @param limit: maximum number of objects to count (default: 100000)
+    @param ids: ids of shared module globals from `shared` (default: None
+        to collect them)
+    '''
+    if ids is None:
+        ids = shared()
+    seen = set()
+    pending = [thing]
+    size = 0
+    while pending and len(seen) < limit:
+        this = pending.pop()
+        if id(this) in seen or id(this) in ids or isinstance(
+            this, (ModuleType, type)
+        ):
+            continue
+        seen.add(id(this))
+        size += sys.getsizeof(this, 0)
+        pending.extend(gc.get_referents(this))
+    return size
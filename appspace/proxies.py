@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+'''appspace compiled namespace proxies'''
+
+from appspace.keys import (
+    ALazyLoad, ALifetime, AAppspace, ANamespace, AppLookupError, NoAppError)
+
+__all__ = ('Proxy', 'compiled')
+
+
+class Proxy(object):
+
+    '''compiled namespace proxy'''
+
+    __slots__ = ('_manager', '_label')
+
+    def __init__(self, manager, label):
+        '''
+        init
+
+        @param manager: appspace manager
+        @param label: namespace label
+        '''
+        self._manager = manager
+        self._label = label
+
+    def __getattr__(self, label):
+        # labels missing from the compiled proxy
+        try:
+            return self._manager.get(label, self._label)
+        except AppLookupError:
+            raise NoAppError(label)
+
+    def __getitem__(self, label):
+        return getattr(self, label)
+
+    def __call__(self, label, *args, **kw):
+        return self._manager._invoke(
+            getattr(self, label), label, self._label, args, kw,
+        )
+
+    def __repr__(self):
+        return 'compiled {label} namespace'.format(label=self._label)
+
+
+class Stale(Proxy):
+
+    '''proxy regenerated on next access'''
+
+    __slots__ = ()
+
+    def __getattr__(self, label):
+        try:
+            self.__class__ = generate(self._manager, self._label)
+        except AppLookupError:
+            raise NoAppError(label)
+        return getattr(self, label)
+
+
+class Live(object):
+
+    '''descriptor getting component from its lifetime on every access'''
+
+    __slots__ = ('lifetime',)
+
+    def __init__(self, lifetime):
+        self.lifetime = lifetime
+
+    def __get__(self, this, that):
+        return self.lifetime.get()
+
+
+def compiled(manager, label):
+    '''
+    get compiled proxy for namespace
+
+    @param manager: appspace manager
+    @param label: namespace label
+    '''
+    proxies = manager._proxies
+    try:
+        return proxies[label]
+    except KeyError:
+        proxy = proxies[label] = Stale(manager, label)
+        return proxy
+
+
+def generate(manager, label):
+    '''
+    generate proxy class for namespace
+
+    @param manager: appspace manager
+    @param label: namespace label
+    '''
+    key = manager._key if label == manager._root else manager.namespace(label)
+    keyed = manager.keyed
+    # namespace labels take precedence over other namespaces
+    attrs = dict(
+        (name, compiled(manager, name)) for name, _ in manager.lookupAll(
+            [ANamespace], ANamespace,
+        )
+    )
+    for name, thing in manager.lookupAll([key], key):
+        if keyed(ALifetime, thing):
+            attrs[name] = Live(thing)
+            continue
+        if keyed(ALazyLoad, thing):
+            thing = manager._unlazy(name, key, thing)
+        if keyed(AAppspace, thing):
+            # compile included branch appspace
+            thing = thing.compile()
+        # keep functions from binding to proxy
+        attrs[name] = staticmethod(thing) if hasattr(
+            type(thing), '__get__'
+        ) else thing
+    for name in Proxy.__slots__:
+        attrs.pop(name, None)
+    attrs['__slots__'] = ()
+    return type('{0}Proxy'.format(label or 'root'), (Proxy,), attrs)
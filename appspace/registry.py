@@ -3,16 +3,82 @@
 
 import uuid
 import hashlib
+from threading import RLock
 from inspect import isclass
+from contextlib import contextmanager
 
 from stuf.six import u, strings
 
-from appspace.utils import lazyimport, checkname
+try:
+    from threading import get_ident
+except ImportError:  # pragma: no cover
+    try:
+        from thread import get_ident
+    except ImportError:
+        from _thread import get_ident
+try:
+    import tracemalloc
+except ImportError:  # pragma: no cover
+    tracemalloc = None
+
+from appspace.proxies import Stale
+from appspace.index import LabelIndex
+from appspace.remote import Remote, worker
+from appspace.lifetimes import lifetime
+from appspace.utils import ContextMap, lazyimport, checkname
 from appspace.keys import (
     ALazyLoad, AppStore, InterfaceClass, AApp, StrictAppStore, ANamespace,
-    AManager, appifies)
+    AManager, ALifetime, BaseAdapterRegistry, ConfigurationError, appifies)
 
-__all__ = ('LazyLoad', 'Registry', 'StrictRegistry')
+__all__ = ('Component', 'LazyLoad', 'Registry', 'StrictRegistry')
+
+# thing missing from snapshot
+_missing = object()
+# namespace scope and current namespace of managers in each execution
+# context
+_scopes = ContextMap('appspace.scope')
+_currents = ContextMap('appspace.current')
+
+
+class Component(object):
+
+    '''component with registration options'''
+
+    __slots__ = ['thing', 'options']
+
+    def __init__(self, thing, **options):
+        '''
+        init
+
+        @param thing: component or import path to component
+        @param **options: registration options (e.g. `lifetime`)
+        '''
+        self.thing = thing
+        self.options = options
+
+    def __repr__(self):
+        return '{thing} with {options}'.format(
+            thing=self.thing, options=self.options,
+        )
+
+
+class _Cell(object):
+
+    '''snapshot entry changed by a publish that is still in progress'''
+
+    __slots__ = ('version', 'thing', 'previous')
+
+    def __init__(self, version, thing, previous):
+        '''
+        init
+
+        @param version: registry version publishing change
+        @param thing: changed thing
+        @param previous: thing before change
+        '''
+        self.version = version
+        self.thing = thing
+        self.previous = previous
 
 
 @appifies(ALazyLoad)
@@ -36,31 +102,331 @@ class LazyLoad(object):
 
 class RegistryMixin(object):
 
-    def __init__(self, label, key=AApp):
+    def __init__(self, label, key=AApp, bases=()):
         '''
         init
 
         @param label: label for internal namespace
         @param key: registry key (default: AApp)
+        @param bases: registries lookups fall through to (default: ())
         '''
-        super(RegistryMixin, self).__init__()
+        # compiled namespace proxies (before any registry change)
+        self._proxies = {}
+        # published key -> label -> thing of streamlined registrations
+        self._snapshot = {}
+        # version of last publish
+        self._version = 0
+        # serializes writers (readers only use the published snapshot)
+        self._writer = RLock()
+        # (key, label) changed since snapshot was last published in batch
+        self._pending = None
+        # thread identifier of batching writer
+        self._batcher = None
+        # change notification deferred until batch exits
+        self._deferred = False
+        # whether a lazy thing is being replaced by what it loaded
+        self._loading = False
+        # label index of snapshot (built on first search)
+        self._index = None
+        super(RegistryMixin, self).__init__(bases)
         self._key = key
-        # root and current label
-        self._root = self._current = label
+        # root label
+        self._root = label
+        # result caches of pure components
+        self._memos = {}
+        # resolved dotted paths
+        self._routes = {}
+        # memory traced while loading lazy things
+        self._footprints = {}
+        self._tracing = False
         # register key under namespace
         self.ez_register(ANamespace, label, key)
         # register manager under label
         self.ez_register(AManager, label, self)
 
+    def _get_current(self):
+        current = _currents.get(self)
+        if current is None:
+            current = _scopes.get(self)
+        return self._root if current is None else current
+
+    def _set_current(self, label):
+        _currents.set(self, label)
+
+    # current namespace label (defaults to namespace scope)
+    _current = property(_get_current, _set_current)
+
+    def _reset(self):
+        # reset current namespace label to namespace scope
+        _currents.set(self, None)
+
+    def _configure(self, thing, options):
+        # host component in worker process
+        host = options.pop('remote', None)
+        if host:
+            if options:
+                raise ConfigurationError(
+                    'unknown options {0} for remote component {1}'.format(
+                        ', '.join(sorted(options)), thing,
+                    )
+                )
+            if not isinstance(thing, strings):
+                raise ConfigurationError(
+                    'remote component {0} needs import path'.format(thing)
+                )
+            return Remote(thing, worker() if host is True else host)
+        # wrap component in lifetime
+        kind = options.pop('lifetime', None)
+        if kind is not None:
+            return lifetime(kind, thing, **options)
+        if options:
+            raise ConfigurationError(
+                'unknown options {0}'.format(', '.join(options))
+            )
+        return self._lazy(thing)
+
     def _lazy(self, thing):
         return LazyLoad(thing) if isinstance(
             thing, (strings, tuple)
         ) else thing
 
     def _unlazy(self, label, key, thing):
-        return self.load(
-            label, key, thing.path
-        ) if self.keyed(ALazyLoad, thing) else thing
+        if self.keyed(ALazyLoad, thing):
+            # load into registry lazy thing was registered in
+            for registry in self.ro:
+                if isinstance(registry, RegistryMixin) and (
+                    registry._published(key, label) is thing
+                ):
+                    return registry.load(label, key, thing.path, thing)
+            return self.load(label, key, thing.path, thing)
+        if self.keyed(ALifetime, thing):
+            return thing.get()
+        return thing
+
+    def _find(self, key, label):
+        # lock free lookup in published snapshots falling through to bases
+        for registry in self.ro:
+            try:
+                if registry._pending is None or (
+                    registry._batcher != get_ident()
+                ):
+                    thing = registry._snapshot[key][label]
+                    if type(thing) is _Cell:
+                        # read version after cell so the change is seen
+                        # only once its whole publish is
+                        thing = thing.thing if (
+                            thing.version <= registry._version
+                        ) else thing.previous
+                        if thing is _missing:
+                            continue
+                    return thing
+                # batching thread sees its unpublished changes
+                thing = registry.registered([key], key, label)
+                if thing is not None:
+                    return thing
+            except (KeyError, AttributeError):
+                pass
+
+    def _published(self, key, label):
+        # thing in published snapshot (None if missing)
+        thing = self._snapshot.get(key, {}).get(label)
+        if type(thing) is _Cell:
+            thing = thing.thing if (
+                thing.version <= self._version
+            ) else thing.previous
+        return None if thing is _missing else thing
+
+    def _publish(self, changes):
+        # changes are written in place as cells of the next version and
+        # become visible together when the version is bumped, so publishing
+        # costs the same however large the snapshot is
+        registered = self.registered
+        keyed = self.keyed
+        snapshot = self._snapshot
+        updates = {}
+        for key, label in changes:
+            updates.setdefault(key, {})[label] = registered([key], key, label)
+        if all(
+            keyed(ALazyLoad, snapshot.get(k, {}).get(l)) and v is not None
+            for k, labels in updates.items() for l, v in labels.items()
+        ):
+            # replacing lazy things with what they load changes no lookup
+            # result, so it needs neither a new version nor reindexing
+            for key, labels in updates.items():
+                snapshot[key].update(labels)
+            return
+        version = self._version + 1
+        for key, labels in updates.items():
+            things = snapshot.get(key)
+            if things is None:
+                things = snapshot[key] = {}
+            for label, thing in labels.items():
+                things[label] = _Cell(
+                    version, _missing if thing is None else thing,
+                    things.get(label, _missing),
+                )
+        self._version = version
+        # settle cells into plain entries now every reader sees them
+        for key, labels in updates.items():
+            things = snapshot[key]
+            for label, thing in labels.items():
+                if thing is None:
+                    del things[label]
+                else:
+                    things[label] = thing
+            if not things:
+                del snapshot[key]
+        self._reindex(updates)
+
+    def _names(self):
+        # namespace labels of namespace keys, including those of bases
+        return dict(
+            (k, l) for l, k in self.lookupAll([ANamespace], ANamespace)
+        )
+
+    def _searched(self, how, query):
+        # search label index of published snapshot (built on first search)
+        # while holding off writers that change it in place
+        with self._writer:
+            index = self._index
+            if index is None:
+                names = self._names()
+                index = self._index = LabelIndex.build(
+                    (names[k], l) for k, things in self._snapshot.items()
+                    if k in names for l in things
+                )
+            return getattr(index, how)(query)
+
+    def _reindex(self, updates):
+        # keep built label index in step with snapshot
+        index = self._index
+        if index is None:
+            return
+        if ANamespace in updates:
+            # namespaces changed so index is rebuilt on next search
+            self._index = None
+            return
+        names = self._names()
+        added, removed = [], []
+        for key, labels in updates.items():
+            namespace = names.get(key)
+            if namespace is not None:
+                for label, thing in labels.items():
+                    (removed if thing is None else added).append(
+                        (namespace, label)
+                    )
+        if added or removed:
+            index.update(added, removed)
+
+    def _written(self, required, provided, name):
+        # publish change to streamlined registration
+        if len(required) == 1 and required[0] is provided:
+            pending = self._pending
+            if pending is None:
+                self._publish([(provided, name)])
+            else:
+                pending.add((provided, name))
+
+    def _listeners(self, key, label):
+        # precomputed subscribers (dropped on any registry change)
+        fanout = self._fanout
+        try:
+            return fanout[(key, label)]
+        except KeyError:
+            this = self.lookup1(key, key, label)
+            subscribers = fanout[(key, label)] = tuple(
+                self.subscriptions([key], this)
+            ) if isinstance(this, InterfaceClass) else ()
+            return subscribers
+
+    def anotify(self, key, label, event):
+        '''
+        deliver event to subscribers concurrently
+
+        returns awaitable gathering the results of all subscribers.
+        coroutine subscribers run as tasks and other subscribers run in the
+        event loop's default executor so they neither block the loop nor
+        leave tasks unawaited when they raise
+
+        @param key: key to lookup
+        @param label: label to lookup
+        @param event: event to deliver
+        '''
+        from asyncio import (
+            gather, ensure_future, get_event_loop, iscoroutinefunction,
+        )
+        loop = get_event_loop()
+        return gather(*[
+            ensure_future(s(event)) if iscoroutinefunction(s)
+            else loop.run_in_executor(None, s, event)
+            for s in self._listeners(key, label)
+        ])
+
+    @contextmanager
+    def batch(self):
+        '''
+        publish registrations made within a with block at once
+
+        lookups from other threads see the registry as it was before the
+        block until the block exits, and change notifications are sent
+        once when it exits
+        '''
+        with self._writer:
+            outer = self._pending is not None
+            if not outer:
+                self._batcher = get_ident()
+                self._pending = set()
+            try:
+                yield self
+            finally:
+                if not outer:
+                    pending, self._pending = self._pending, None
+                    self._batcher = None
+                    if pending:
+                        self._publish(pending)
+                    if self._deferred:
+                        self._deferred = False
+                        self.changed(self)
+
+    def changed(self, originally_changed):
+        if getattr(originally_changed, '_loading', False):
+            # only clear lookup caches of this and derived registries
+            self._v_lookup.changed(originally_changed)
+            for registry in tuple(getattr(self, '_v_subregistries', ())):
+                registry.changed(originally_changed)
+            return
+        if self._pending is not None:
+            # keep lookup caches exact but notify once batch exits
+            BaseAdapterRegistry.changed(self, originally_changed)
+            self._deferred = True
+            return
+        super(RegistryMixin, self).changed(originally_changed)
+        self._fanout = {}
+        # regenerate compiled proxies on next access
+        for proxy in self._proxies.values():
+            proxy.__class__ = Stale
+
+    def compact(self):
+        '''rebuild registry storage into freshly sized containers'''
+        def copy(components, depth):
+            if not depth:
+                return dict(components)
+            return dict(
+                (k, copy(v, depth - 1)) for k, v in components.items()
+            )
+        with self._writer:
+            # order n registrations nest n required keys and a provided key
+            self._adapters = [
+                copy(c, order + 1) for order, c in enumerate(self._adapters)
+            ]
+            self._subscribers = [
+                copy(c, order + 1)
+                for order, c in enumerate(self._subscribers)
+            ]
+            self._snapshot = dict(
+                (k, dict(v)) for k, v in self._snapshot.items()
+            )
+            self.changed(self)
 
     @classmethod
     def create(cls):
@@ -83,10 +449,7 @@ class RegistryMixin(object):
         @param key: key to lookup
         @param label: label to lookup
         '''
-        app = self.lookup1(key, key, label)
-        return self.load(
-            label, key, app.path
-        ) if self.keyed(ALazyLoad, app) else app
+        return self._unlazy(label, key, self._find(key, label))
 
     def ez_register(self, key=None, label=None, app=None):
         '''
@@ -105,7 +468,7 @@ class RegistryMixin(object):
         @param key: key to extend to
         @param label: label to extend to
         '''
-        self.subscribe(key, self.key(key, label), app)
+        self.subscribe([key], self.key(key, label), app)
 
     def ez_unregister(self, key, label):
         '''
@@ -114,7 +477,8 @@ class RegistryMixin(object):
         @param key: key to lookup
         @param label: label to lookup
         '''
-        self.unregister([key], key, label, self.ez_lookup(key, label))
+        # unregistering whatever is registered never loads lazy things
+        self.unregister([key], key, label)
 
     unkey = ez_unregister
 
@@ -125,7 +489,7 @@ class RegistryMixin(object):
         @param key: key to lookup
         @param label: label to lookup
         '''
-        self.unsubscribe(key, self.ez_lookup(key, label))
+        self.unsubscribe([key], self.ez_lookup(key, label))
 
     @staticmethod
     def keyed(k=False, v=False):
@@ -147,27 +511,111 @@ class RegistryMixin(object):
         @param key: key to register
         @param label: label to register
         '''
-        this = self.lookup1(key, key, label)
+        this = self._find(key, label)
         if this is None:
-            this = self.create()
-            self.register([key], key, label, this)
+            with self._writer:
+                this = self._find(key, label)
+                if this is None:
+                    this = self.create()
+                    self.register([key], key, label, this)
         return this
 
-    def load(self, label, key, module):
+    def load(self, label, key, module, lazy=None):
         '''
         import thing into appspace
 
         @param label: appspaced thing label
         @param key: appspace key
         @param module: module path
+        @param lazy: lazy thing being loaded, only replaced if still
+            registered (default: None)
         '''
+        tracing = self._tracing
+        if tracing:
+            before = tracemalloc.get_traced_memory()[0]
         # add branch appspace from include
         app = lazyimport(module[-1]) if isinstance(
             module, tuple
         ) else lazyimport(module)
-        # register get
-        self.register([key], key, label, app)
-        return app
+        if tracing:
+            self._footprints[(key, label)] = (
+                tracemalloc.get_traced_memory()[0] - before
+            )
+        with self._writer:
+            current = self.registered([key], key, label)
+            if lazy is None or current is lazy:
+                # replacing a lazy thing with what it loaded changes no
+                # lookup result, so generation stamped routes and proxies
+                # stay valid
+                self._loading = self.keyed(ALazyLoad, current)
+                try:
+                    self.register([key], key, label, app)
+                finally:
+                    self._loading = False
+                return app
+        # lazy thing was replaced while loading so keep newer registration
+        return app if current is None else self._unlazy(label, key, current)
+
+    def notify(self, key, label, event):
+        '''
+        deliver event to subscribers
+
+        @param key: key to lookup
+        @param label: label to lookup
+        @param event: event to deliver
+        '''
+        return [s(event) for s in self._listeners(key, label)]
+
+    def notify_many(self, key, label, events):
+        '''
+        deliver batch of events to subscribers
+
+        @param key: key to lookup
+        @param label: label to lookup
+        @param events: iterable of events to deliver
+        '''
+        subscribers = self._listeners(key, label)
+        for event in events:
+            for subscriber in subscribers:
+                subscriber(event)
+
+    def register(self, required, provided, name, value):
+        with self._writer:
+            super(RegistryMixin, self).register(
+                required, provided, name, value,
+            )
+            self._written(required, provided, name)
+
+    def unregister(self, required, provided, name, value=None):
+        with self._writer:
+            super(RegistryMixin, self).unregister(
+                required, provided, name, value,
+            )
+            self._written(required, provided, name)
+
+    def subscribe(self, required, provided, value):
+        with self._writer:
+            super(RegistryMixin, self).subscribe(required, provided, value)
+
+    def unsubscribe(self, required, provided, value=None):
+        with self._writer:
+            super(RegistryMixin, self).unsubscribe(required, provided, value)
+
+    def registrations(self, key=None):
+        '''
+        iterate over key, label, and thing of streamlined registrations
+
+        @param key: only registrations under this key (default: None)
+        '''
+        adapters = self._adapters
+        if len(adapters) < 2:
+            return
+        keys = adapters[1].items() if key is None else [
+            (key, adapters[1].get(key, {}))
+        ]
+        for required, provides in list(keys):
+            for label, thing in list(provides.get(required, {}).items()):
+                yield required, label, thing
 
     safename = staticmethod(checkname)
 
@@ -181,11 +629,19 @@ class Registry(RegistryMixin, AppStore):
 
     '''easy registry'''
 
-    __slots__ = ('_current', '_root', '_key')
+    __slots__ = (
+        '_root', '_key', '_fanout', '_proxies', '_memos', '_footprints',
+        '_tracing', '_snapshot', '_version', '_writer', '_pending', '_batcher',
+        '_deferred', '_loading', '_index', '_routes',
+    )
 
 
 class StrictRegistry(RegistryMixin, StrictAppStore):
 
     '''strict registry'''
 
-    __slots__ = ('_current', '_root', '_key')
+    __slots__ = (
+        '_root', '_key', '_fanout', '_proxies', '_memos', '_footprints',
+        '_tracing', '_snapshot', '_version', '_writer', '_pending', '_batcher',
+        '_deferred', '_loading', '_index', '_routes',
+    )
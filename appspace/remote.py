@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+'''appspace components hosted in worker processes'''
+
+import os
+import atexit
+import tempfile
+import threading
+import multiprocessing
+from uuid import uuid4
+from multiprocessing.connection import Client, Listener
+
+from appspace.lifetimes import Pool
+from appspace.utils import lazyimport
+from appspace.keys import RemoteError
+
+__all__ = ('Remote', 'Worker', 'worker')
+
+# message kinds
+CALL = 0
+BATCH = 1
+
+# default worker shared by remote registrations
+_worker = None
+_lock = threading.Lock()
+
+
+def _run(path, args, kw):
+    # (succeeded, result or exception) of calling app at import path
+    try:
+        return True, lazyimport(path)(*args, **kw)
+    except Exception as exc:
+        return False, exc
+
+
+def _reply(conn, reply):
+    try:
+        conn.send(reply)
+    except Exception as exc:
+        # result or exception could not be pickled
+        conn.send((False, RemoteError(repr(exc))))
+
+
+def _handle(conn):
+    # serve requests on one connection in the order they arrive
+    with conn:
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                return
+            if message[0] == CALL:
+                _reply(conn, _run(*message[1:]))
+            else:
+                _reply(conn, (True, [_run(*call) for call in message[1]]))
+
+
+def serve(address, authkey, ready):
+    '''
+    worker process main loop
+
+    @param address: Unix socket path
+    @param authkey: connection authentication key
+    @param ready: pipe connection signalled once listening
+    '''
+    listener = Listener(address, 'AF_UNIX', authkey=authkey)
+    ready.send(os.getpid())
+    ready.close()
+    while True:
+        thread = threading.Thread(target=_handle, args=(listener.accept(),))
+        thread.daemon = True
+        thread.start()
+
+
+def _result(reply):
+    ok, result = reply
+    if not ok:
+        raise result
+    return result
+
+
+class Worker(object):
+
+    '''worker process hosting remote components'''
+
+    __slots__ = (
+        'size', 'window', 'address', 'pid', '_context', '_authkey',
+        '_process', '_pool', '_lock',
+    )
+
+    def __init__(self, size=8, window=64, context='spawn'):
+        '''
+        init
+
+        @param size: maximum number of pooled connections (default: 8)
+        @param window: maximum number of pipelined requests awaiting reply
+            (default: 64)
+        @param context: multiprocessing start method (default: 'spawn')
+        '''
+        self.size = size
+        self.window = window
+        self.address = os.path.join(
+            tempfile.gettempdir(), 'appspace-{0}.sock'.format(uuid4().hex),
+        )
+        self.pid = None
+        # python < 3.4 has one start method
+        self._context = multiprocessing.get_context(context) if hasattr(
+            multiprocessing, 'get_context'
+        ) else multiprocessing
+        self._authkey = os.urandom(16)
+        self._process = None
+        self._pool = Pool(self._connect, size, close='close')
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return 'worker {pid} at {address}'.format(
+            pid=self.pid, address=self.address,
+        )
+
+    def _alive(self):
+        process = self._process
+        return process is not None and process.is_alive()
+
+    def _connect(self):
+        if not self._alive():
+            self.start()
+        return Client(self.address, 'AF_UNIX', authkey=self._authkey)
+
+    def _exchange(self, exchange):
+        # run exchange over pooled connection
+        pool = self._pool
+        conn = pool.checkout()
+        try:
+            result = exchange(conn)
+        except BaseException:
+            # connection may hold unread replies
+            pool.discard(conn)
+            if not self._alive():
+                # idle connections to a dead worker are broken too
+                pool.clear()
+            raise
+        pool.checkin(conn)
+        return result
+
+    def _unlink(self):
+        try:
+            os.unlink(self.address)
+        except OSError:
+            pass
+
+    def start(self):
+        '''start worker process, replacing one that died'''
+        with self._lock:
+            process = self._process
+            if process is not None:
+                if process.is_alive():
+                    return
+                process.join()
+                self._process = None
+                self._pool.clear()
+                self._unlink()
+            read, write = self._context.Pipe(False)
+            process = self._context.Process(
+                target=serve, args=(self.address, self._authkey, write),
+            )
+            process.daemon = True
+            process.start()
+            write.close()
+            try:
+                self.pid = read.recv()
+            except EOFError:
+                raise RemoteError('worker failed to start')
+            finally:
+                read.close()
+            self._process = process
+
+    def close(self):
+        '''stop worker process and drop pooled connections'''
+        with self._lock:
+            self._pool.clear()
+            process, self._process = self._process, None
+            if process is not None:
+                process.terminate()
+                process.join()
+                self._unlink()
+            self.pid = None
+
+    def call(self, path, args=(), kw=None):
+        '''
+        call app in worker
+
+        @param path: import path to app
+        @param args: positional arguments (default: ())
+        @param kw: keyword arguments (default: None)
+        '''
+        def exchange(conn):
+            conn.send((CALL, path, tuple(args), kw or {}))
+            return conn.recv()
+        return _result(self._exchange(exchange))
+
+    def pipeline(self, calls):
+        '''
+        send calls without waiting for each reply
+
+        @param calls: iterable of (import path, args, kw) tuples
+        '''
+        window = self.window
+
+        def exchange(conn):
+            replies = []
+            pending = 0
+            for path, args, kw in calls:
+                # bound unanswered requests so neither side blocks on a full
+                # socket buffer
+                if pending >= window:
+                    replies.append(conn.recv())
+                    pending -= 1
+                conn.send((CALL, path, tuple(args), kw or {}))
+                pending += 1
+            replies.extend(conn.recv() for _ in range(pending))
+            return replies
+        # every reply is read before raising so connection stays usable
+        return [_result(reply) for reply in self._exchange(exchange)]
+
+    def batch(self, calls):
+        '''
+        send calls as one message
+
+        @param calls: iterable of (import path, args, kw) tuples
+        '''
+        calls = [
+            (path, tuple(args), kw or {}) for path, args, kw in calls
+        ]
+
+        def exchange(conn):
+            conn.send((BATCH, calls))
+            return conn.recv()
+        return [_result(reply) for reply in _result(self._exchange(exchange))]
+
+
+def worker():
+    '''default worker shared by remote registrations'''
+    global _worker
+    if _worker is None:
+        with _lock:
+            if _worker is None:
+                _worker = Worker()
+                atexit.register(_worker.close)
+    return _worker
+
+
+class Remote(object):
+
+    '''proxy calling component in worker process'''
+
+    __slots__ = ('path', 'worker')
+
+    def __init__(self, path, worker):
+        '''
+        init
+
+        @param path: import path to component
+        @param worker: worker hosting component
+        '''
+        self.path = path
+        self.worker = worker
+
+    def __call__(self, *args, **kw):
+        return self.worker.call(self.path, args, kw)
+
+    def __repr__(self):
+        return 'remote {path} in {worker}'.format(
+            path=self.path, worker=self.worker,
+        )
+
+    def map(self, *iterables):
+        '''
+        call component over arguments in one batch
+
+        @param *iterables: iterables of positional arguments
+        '''
+        path = self.path
+        return self.worker.batch((path, args, None) for args in zip(*iterables))
+
+    def pipeline(self, *iterables):
+        '''
+        call component over arguments with pipelined requests
+
+        @param *iterables: iterables of positional arguments
+        '''
+        path = self.path
+        return self.worker.pipeline(
+            (path, args, None) for args in zip(*iterables)
+        )
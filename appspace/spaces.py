@@ -1,17 +1,54 @@
 # -*- coding: utf-8 -*-
 '''appspace spaces'''
 
+import os
+import json
+from inspect import isclass
 from functools import partial
 from itertools import starmap
+from collections import namedtuple
 
 from stuf.six import strings
 from stuf.utils import selfname, exhaust, twoway, exhaustmap
 
-from appspace.utils import lazyimport
-from appspace.managers import Manager, StrictManager
-from appspace.keys import ABranch, ANamespace, AApp, appifies
-
-__all__ = ('Branch', 'Namespace', 'Patterns', 'include', 'patterns')
+from appspace.trace import traced
+from appspace.registry import Component
+from appspace.utils import lazyimport, checkpath
+from appspace.managers import Manager, RootMixin, StrictManager
+from appspace.keys import (
+    ABranch, ANamespace, AApp, ConfigurationError, appifies)
+
+__all__ = (
+    'Branch', 'Broken', 'Namespace', 'Patterns', 'file_patterns', 'include',
+    'patterns', 'validate',
+)
+
+# broken appconf entry
+Broken = namedtuple('Broken', 'namespace label path reason')
+
+
+def _path(thing):
+    # import path of appconf thing
+    if isinstance(thing, Component):
+        thing = thing.thing
+    if isinstance(thing, tuple):
+        thing = thing[-1]
+    return thing if isinstance(thing, strings) else None
+
+
+def _validate(entries, static=False, workers=None):
+    # check import paths across a thread pool
+    from concurrent.futures import ThreadPoolExecutor
+    entries = [(n, l, _path(t)) for n, l, t in entries]
+    paths = sorted(set(p for _, _, p in entries if p is not None))
+    with ThreadPoolExecutor(workers or 8) as pool:
+        reasons = dict(zip(paths, pool.map(
+            lambda x: checkpath(x, static), paths,
+        )))
+    return [
+        Broken(n, l, p, reasons[p]) for n, l, p in entries
+        if p is not None and reasons[p] is not None
+    ]
 
 
 class _Filter(object):
@@ -20,6 +57,19 @@ class _Filter(object):
     def _filter(self, x):
         return not x[0].startswith('_')
 
+    @classmethod
+    def entries(cls):
+        '''namespace, label, and thing of each class configuration entry'''
+        label = selfname(cls)
+        for name, thing in vars(cls).items():
+            if not cls._filter((name, thing)):
+                continue
+            if isclass(thing) and issubclass(thing, _PatternMixin):
+                for entry in thing.entries():
+                    yield entry
+            else:
+                yield label, name, thing
+
 
 class Patterns(_Filter):
 
@@ -43,11 +93,16 @@ class Patterns(_Filter):
             # load key if string
             key = lazyimport(key)
         manager = cls._manager(l, key)  # pylint: disable-msg=e1121
-        b = partial(manager.keyed, ABranch)
-        n = partial(manager.keyed, ANamespace)
-        m = manager.set
-        t = lambda x, y: y.build(manager) if (n(y) or b(y)) else m(y, x, l)
-        exhaustmap(vars(cls), t, cls._filter)
+        with traced(cls, 'patterns', manager) as trace:
+            keyed = trace.counted('keyed', manager.keyed)
+            b = partial(keyed, ABranch)
+            n = partial(keyed, ANamespace)
+            m = trace.entry(manager.set)
+            t = lambda x, y: y.build(manager) if (
+                n(y) or b(y)
+            ) else m(y, x, l)
+            with manager.batch():
+                exhaustmap(vars(cls), t, cls._filter)
         return manager
 
     @staticmethod
@@ -56,13 +111,30 @@ class Patterns(_Filter):
         factory for manager
 
         @param label: label for manager
+        @param *args: tuples of label, thing, and optional options
         '''
         # build manager
         manager = manager(label)
         # register things in manager
-        exhaust(starmap(lambda x, y: manager.set(y, x), iter(args)))
+        with manager.batch():
+            exhaust(starmap(
+                lambda x, y, z=None: manager.set(y, x, **(z or {})),
+                iter(args),
+            ))
         return manager
 
+    @classmethod
+    def validate(cls, static=False, workers=None):
+        '''
+        check import paths of class configuration without importing them
+
+        returns list of broken entries
+
+        @param static: check attributes in module source (default: False)
+        @param workers: number of threads checking paths (default: None)
+        '''
+        return _validate(cls.entries(), static, workers)
+
     @classmethod
     def patterns(cls, label, *args):
         '''
@@ -77,7 +149,7 @@ class Patterns(_Filter):
 class _PatternMixin(_Filter):
 
     @classmethod
-    def _key(cls, label, manager):
+    def _key(cls, label, manager, keys=None):
         try:
             # lazily load key
             key = cls.key
@@ -86,7 +158,7 @@ class _PatternMixin(_Filter):
             # register class key
             manager.ez_register(ANamespace, label, key)
         except AttributeError:
-            key = manager.key(ANamespace, label)
+            (keys or manager.key)(ANamespace, label)
 
 
 @appifies(ANamespace)
@@ -97,11 +169,14 @@ class Branch(_PatternMixin):
     @classmethod
     def build(cls, manager):
         '''gather branch configuration'''
-        cls._key(selfname(cls), manager)
-        i = cls.include
-        m = manager.set
-        t = lambda x: not x[0].startswith('_') or isinstance(x[1], strings)
-        exhaustmap(vars(cls), lambda x, y: m(i(y), x), t)
+        with traced(cls, 'branch', manager) as trace:
+            cls._key(selfname(cls), manager, trace.creating(manager))
+            i = cls.include
+            m = trace.entry(manager.set)
+            t = lambda x: not x[0].startswith('_') or isinstance(
+                x[1], strings
+            )
+            exhaustmap(vars(cls), lambda x, y: m(i(y), x), t)
 
     @staticmethod
     def include(module):
@@ -121,12 +196,128 @@ class Namespace(_PatternMixin):
     @classmethod
     def build(cls, manager):
         '''gather namespace configuration'''
-        label = selfname(cls)
-        cls._key(label, manager)
-        m = manager.set
-        n = partial(manager.keyed, ANamespace)
-        t = lambda k, v: v.build(manager) if n(v) else m(v, k, label)
-        exhaustmap(vars(cls), t, cls._filter)
+        with traced(cls, 'namespace', manager) as trace:
+            label = selfname(cls)
+            cls._key(label, manager, trace.creating(manager))
+            m = trace.entry(manager.set)
+            n = partial(trace.counted('keyed', manager.keyed), ANamespace)
+            t = lambda k, v: v.build(manager) if n(v) else m(v, k, label)
+            exhaustmap(vars(cls), t, cls._filter)
+
+
+def validate(label, *args, **kw):
+    '''
+    check import paths of appconf without importing them
+
+    returns list of broken entries
+
+    @param label: label for manager
+    @param *args: tuples of label, thing, and optional options
+    @param static: check attributes in module source (default: False)
+    @param workers: number of threads checking paths (default: None)
+    '''
+    return _validate(
+        ((label, a[0], a[1]) for a in args),
+        kw.get('static', False),
+        kw.get('workers'),
+    )
+
+
+def _record(line, name, strict, chain):
+    # namespace, label, thing, and options of appconf file line
+    record = json.loads(line)
+    if isinstance(record, list):
+        # [namespace, label, path, options]
+        record = dict(zip(('namespace', 'label', 'path', 'options'), record))
+    label = record['label']
+    namespace = record.get('namespace')
+    if namespace is not None and not isinstance(namespace, strings):
+        raise TypeError('namespace {0!r} is not a string'.format(namespace))
+    if 'path' in record:
+        thing = record['path']
+    elif 'include' in record:
+        thing = Branch.include(record['include'])
+    else:
+        thing = _file_patterns(label, os.path.join(
+            os.path.dirname(name), record['file'],
+        ), strict, chain)
+    return namespace, label, thing, record.get('options') or {}
+
+
+def _flatten(flat, namespace):
+    # last part of dotted namespace, which must not stand for another
+    # dotted namespace in the same file
+    parts = namespace.split('.')
+    for n, part in enumerate(parts, 1):
+        dotted = '.'.join(parts[:n])
+        if flat.setdefault(part, dotted) != dotted:
+            raise ConfigurationError(
+                'namespaces {0} and {1} both flatten to {2}'.format(
+                    flat[part], dotted, part,
+                )
+            )
+    return parts
+
+
+def _file_patterns(label, path, strict, chain):
+    # build manager from appconf file reached through chain of files
+    real = os.path.realpath(path)
+    if real in chain:
+        raise ConfigurationError('{0} includes itself through {1}'.format(
+            path, ' -> '.join(chain),
+        ))
+    chain += (real,)
+    manager = (StrictManager if strict else Manager)(label)
+    key = partial(manager.key, ANamespace)
+    # last part of each dotted namespace -> dotted namespace
+    flat = {label: label}
+    namespaces = set([None, '', label])
+    with open(path) as stream, manager.batch():
+        for number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                namespace, name, thing, options = _record(
+                    line, path, strict, chain,
+                )
+                if namespace not in namespaces:
+                    for part in _flatten(flat, namespace):
+                        key(part)
+                    namespaces.add(namespace)
+                if namespace:
+                    namespace = namespace.rpartition('.')[-1]
+                if isinstance(thing, RootMixin):
+                    thing = lazyimport('appspace.builders.Appspace')(thing)
+                manager.set(thing, name, namespace or label, **options)
+            except (
+                ValueError, KeyError, TypeError, AttributeError, IOError,
+                OSError, ConfigurationError,
+            ) as exc:
+                raise ConfigurationError('{0} line {1}: {2!r}'.format(
+                    path, number, exc,
+                ))
+    return manager
+
+
+def file_patterns(label, path, strict=False):
+    '''
+    build manager from appconf file of JSON records, one per line
+
+    records are objects with `label` and one of `path`, `include` (module
+    with branch appspace), or `file` (appconf file relative to this one)
+    plus optional `namespace` (dotted for nested namespaces) and `options`,
+    or [namespace, label, path, options] arrays
+
+    nested namespaces are flat, registered under the last part of their
+    dotted name, so two dotted namespaces in one file ending in the same
+    part (e.g. `a.common` and `b.common`) are rejected
+
+    @param label: label for manager
+    @param path: path to appconf file
+    @param strict: build strict manager (default: False)
+    '''
+    return _file_patterns(label, path, strict, ())
 
 
 factory = Patterns.factory
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+'''coroutines for asyncio tests (kept apart for python < 3.5 syntax)'''
+
+import asyncio
+
+
+def using(plug, labels):
+    '''coroutine looking up square in each namespace from its own task'''
+    async def work(label):
+        with plug.manager.using(label):
+            await asyncio.sleep(0)
+            return plug.square
+
+    async def main():
+        return await asyncio.gather(*[work(label) for label in labels])
+    return main()
+
+
+def doubler(seen):
+    '''coroutine subscriber recording and doubling events'''
+    async def later(event):
+        await asyncio.sleep(0)
+        seen.append(('c', event))
+        return event * 2
+    return later
+
+
+def awaited(awaitable):
+    '''coroutine awaiting awaitable made inside a running event loop'''
+    async def main():
+        return await awaitable()
+    return main()
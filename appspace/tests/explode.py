@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+'''module that must never be imported by validation'''
+
+
+def thing():
+    '''test component'''
+
+
+raise RuntimeError('imported')
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+'''module allocating memory when imported'''
+
+BLOB = bytearray(1 << 20)
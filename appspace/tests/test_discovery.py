@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# pylint: disable-msg=e0611
+'''appspace entry point discovery tests'''
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+
+class TestDiscovery(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.site = os.path.join(self.root, 'site')
+        os.mkdir(self.site)
+        self.cache = os.path.join(self.root, 'cache', 'index.json')
+        self._dist('plugs', 'square = math:sqrt\nfabulous = math:fabs\n')
+        sys.path.append(self.site)
+
+    def tearDown(self):
+        sys.path.remove(self.site)
+        shutil.rmtree(self.root)
+
+    def _dist(self, name, points):
+        info = os.path.join(self.site, '{0}-1.0.dist-info'.format(name))
+        os.mkdir(info)
+        with open(os.path.join(info, 'METADATA'), 'w') as stream:
+            stream.write('Name: {0}\nVersion: 1.0\n'.format(name))
+        with open(os.path.join(info, 'entry_points.txt'), 'w') as stream:
+            stream.write('[appspace.test]\n' + points)
+
+    def test_discover(self):
+        from appspace.discovery import discover
+        self.assertEqual(
+            discover('appspace.test', self.cache),
+            (('fabulous', 'math.fabs'), ('square', 'math.sqrt')),
+        )
+        self.assertEqual(discover('appspace.missing', self.cache), ())
+
+    def test_entry_patterns(self):
+        from math import sqrt
+        from appspace import entry_patterns
+        plug = entry_patterns('helpers', 'appspace.test', self.cache)
+        self.assertEqual(plug.square, sqrt)
+        self.assertEqual(plug.fabulous(-2), 2)
+
+    def test_warm_index(self):
+        from appspace.discovery import discover
+        discover('appspace.test', self.cache)
+        with open(self.cache) as stream:
+            data = json.load(stream)
+        data['groups']['appspace.test'] = [['cached', 'math.exp']]
+        with open(self.cache, 'w') as stream:
+            json.dump(data, stream)
+        # unchanged paths read the persisted index without scanning
+        self.assertEqual(
+            discover('appspace.test', self.cache), (('cached', 'math.exp'),),
+        )
+
+    def test_invalidated(self):
+        from appspace.discovery import discover
+        discover('appspace.test', self.cache)
+        self._dist('more', 'exp = math:exp\n')
+        mtime = os.stat(self.site).st_mtime + 10
+        os.utime(self.site, (mtime, mtime))
+        self.assertEqual(
+            discover('appspace.test', self.cache), (
+                ('exp', 'math.exp'), ('fabulous', 'math.fabs'),
+                ('square', 'math.sqrt'),
+            ),
+        )
+
+    def test_metadata_invalidated(self):
+        from appspace.discovery import discover
+        discover('appspace.test', self.cache)
+        mtime = os.stat(self.site).st_mtime
+        points = os.path.join(
+            self.site, 'plugs-1.0.dist-info', 'entry_points.txt',
+        )
+        with open(points, 'w') as stream:
+            stream.write('[appspace.test]\nexp = math:exp\n')
+        os.utime(points, (mtime + 10, mtime + 10))
+        # path entry itself is unchanged
+        os.utime(self.site, (mtime, mtime))
+        self.assertEqual(
+            discover('appspace.test', self.cache), (('exp', 'math.exp'),),
+        )
+
+    def test_value(self):
+        from appspace.discovery import _path
+        self.assertEqual(_path('os.path:join [extra]'), 'os.path.join')
+        self.assertEqual(_path('os.path'), 'os.path')
+        self.assertEqual(
+            _path('collections:OrderedDict.fromkeys'),
+            'collections:OrderedDict.fromkeys',
+        )
+
+    def test_attribute_chain(self):
+        from collections import OrderedDict
+        from appspace import entry_patterns
+        self._dist('chained', 'keys = collections:OrderedDict.fromkeys\n')
+        mtime = os.stat(self.site).st_mtime + 10
+        os.utime(self.site, (mtime, mtime))
+        plug = entry_patterns('helpers', 'appspace.test', self.cache)
+        self.assertEqual(plug.keys, OrderedDict.fromkeys)
+
+
+if __name__ == '__main__':
+    unittest.main()
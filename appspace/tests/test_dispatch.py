@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+# pylint: disable-msg=e0611
+'''appspace type dispatch tests'''
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+
+class Vector(list):
+
+    '''test batch type'''
+
+
+class Sparse(Vector):
+
+    '''test batch subtype'''
+
+
+def score(x):
+    return x * 2
+
+
+def score_batch(xs):
+    return Vector(x * 2 for x in xs)
+
+
+def score_pair(xs, y):
+    return 'pair'
+
+
+class TestDispatch(unittest.TestCase):
+
+    @staticmethod
+    def _make_multiple():
+        from appspace import patterns
+        return patterns(
+            'helpers',
+            ('score', 'appspace.tests.test_dispatch.score_batch',
+                {'dispatch': 'appspace.tests.test_dispatch.Vector'}),
+            ('score', 'appspace.tests.test_dispatch.score'),
+            ('score', score_pair, {'dispatch': (Vector, int)}),
+        )
+
+    def test_dispatch(self):
+        plug = self._make_multiple()
+        self.assertEqual(plug.score(2), 4)
+        self.assertEqual(plug.score(Vector([1, 2])), [2, 4])
+        self.assertIsInstance(plug.score(Sparse([1])), Vector)
+        self.assertEqual(plug.score(Vector([1]), 2), 'pair')
+        self.assertEqual(plug('score', 3), 6)
+        self.assertEqual(plug.compile().score(Vector([3])), [6])
+
+    def test_cached(self):
+        plug = self._make_multiple()
+        dispatcher = plug.score
+        dispatcher(2)
+        dispatcher(Vector([1]))
+        self.assertIs(dispatcher._cache[(int,)], score)
+        self.assertIs(dispatcher._cache[(Vector,)], score_batch)
+
+    def test_reregister(self):
+        plug = self._make_multiple()
+        plug.score(Vector([1]))
+        plug.manager.set(lambda xs: 'new', 'score', dispatch=Vector)
+        self.assertEqual(plug.score(Vector([1])), 'new')
+        self.assertEqual(plug.score(2), 4)
+
+    def test_unregistered(self):
+        from appspace import AppLookupError
+        from appspace.keys import implementedBy
+        plug = self._make_multiple()
+        manager = plug.manager
+        self.assertEqual(plug.score(Vector([1])), [2])
+        manager.unregister_many(['score'])
+        manager.set(score, 'score', dispatch=int)
+        # variants of the dropped dispatcher are gone with it
+        self.assertRaises(AppLookupError, plug.score, Vector([1]))
+        self.assertEqual(plug.score(2), 4)
+        self.assertIsNone(manager.lookup(
+            [implementedBy(Vector)], manager._key, 'score',
+        ))
+
+    def test_no_default(self):
+        from appspace import patterns, AppLookupError
+        plug = patterns('helpers', ('score', score_batch, {'dispatch': Vector}))
+        self.assertEqual(plug.score(Vector([1])), [2])
+        self.assertRaises(AppLookupError, plug.score, 1)
+
+    def test_lifetime(self):
+        from appspace import patterns
+        from appspace.keys import ConfigurationError
+        plug = patterns('helpers', ('score', score))
+        manager = plug.manager
+        self.assertRaises(
+            ConfigurationError, manager.set, Vector, 'score',
+            lifetime='singleton', dispatch=Vector,
+        )
+        manager.set(Vector, 'batch', lifetime='singleton')
+        # lifetime would become default of dispatcher
+        self.assertRaises(
+            ConfigurationError, manager.set, score_batch, 'batch',
+            dispatch=Vector,
+        )
+        manager.set(score_batch, 'score', dispatch=Vector)
+        self.assertRaises(
+            ConfigurationError, manager.set, Vector, 'score',
+            lifetime='singleton',
+        )
+        self.assertEqual(plug.score(2), 4)
+
+    def test_pending_threads(self):
+        import threading
+        plug = self._make_multiple()
+        dispatcher = plug.score
+        barrier = threading.Barrier(8)
+        results = []
+        def work():
+            barrier.wait()
+            results.append(dispatcher(Vector([1])))
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [[2]] * 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
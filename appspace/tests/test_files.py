@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# pylint: disable-msg=e0611
+'''appspace appconf file tests'''
+
+import os
+import shutil
+import tempfile
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+APPCONF = '''
+# generated appconf
+{"label": "square", "path": "math.sqrt"}
+["", "fabulous", "math.fabs"]
+["subhelpers", "square", "math.exp"]
+{"namespace": "subhelpers", "label": "mrk", "path": "math.isinf"}
+{"namespace": "outer.inner", "label": "floor", "path": "math.floor",
+    "options": {"cache": true}}
+{"label": "misc", "include": "appspace.tests.apps.appconf"}
+{"label": "more", "file": "more.jsonl"}
+'''.replace('\n    ', ' ')
+MORE = '''
+{"label": "ceil", "path": "math.ceil"}
+'''
+
+
+class TestFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = self._write('appconf.jsonl', APPCONF)
+        self._write('more.jsonl', MORE)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _write(self, name, content):
+        path = os.path.join(self.root, name)
+        with open(path, 'w') as stream:
+            stream.write(content)
+        return path
+
+    def test_file_patterns(self):
+        from math import sqrt, fabs, exp, isinf
+        from appspace import file_patterns
+        plug = file_patterns('helpers', self.path)
+        self.assertIs(plug.square, sqrt)
+        self.assertIs(plug.fabulous, fabs)
+        self.assertIs(plug.subhelpers.square, exp)
+        self.assertIs(plug.subhelpers.mrk, isinf)
+
+    def test_nested(self):
+        from math import floor, ceil, exp
+        from appspace import file_patterns
+        manager = file_patterns('helpers', self.path).manager
+        self.assertIs(manager.get_path('outer.inner.floor'), floor)
+        self.assertIsNotNone(manager.cache_info('floor', 'inner'))
+        self.assertIs(manager.get_path('misc.mrnrf'), exp)
+        self.assertIs(manager.get_path('more.ceil'), ceil)
+
+    def test_malformed(self):
+        from appspace import file_patterns
+        from appspace.keys import ConfigurationError
+        path = self._write('broken.jsonl', APPCONF + '{"path": "math.e"}\n')
+        with self.assertRaises(ConfigurationError) as raised:
+            file_patterns('helpers', path)
+        self.assertIn('line 10', str(raised.exception))
+
+    def _broken(self, line, content=APPCONF):
+        from appspace import file_patterns
+        from appspace.keys import ConfigurationError
+        path = self._write('broken.jsonl', content + line + '\n')
+        with self.assertRaises(ConfigurationError) as raised:
+            file_patterns('helpers', path)
+        self.assertIn('broken.jsonl line 10', str(raised.exception))
+        return str(raised.exception)
+
+    def test_bad_namespace(self):
+        self._broken('{"namespace": 3, "label": "x", "path": "math.e"}')
+        self._broken('[["a"], "x", "math.e"]')
+
+    def test_bad_options(self):
+        self._broken('{"label": "x", "path": "math.e", "options": {"y": 1}}')
+        self._broken(
+            '{"label": "x", "path": "math.e", "options": {"lifetime": "no"}}'
+        )
+
+    def test_include_cycle(self):
+        message = self._broken('{"label": "again", "file": "broken.jsonl"}')
+        self.assertIn('includes itself', message)
+        self._write('loop.jsonl', '{"label": "back", "file": "broken.jsonl"}')
+        message = self._broken('{"label": "loop", "file": "loop.jsonl"}')
+        self.assertIn('includes itself', message)
+
+    def test_missing_file(self):
+        self._broken('{"label": "gone", "file": "missing.jsonl"}')
+
+    def test_nested_strict(self):
+        from appspace import file_patterns
+        from appspace.managers import StrictManager
+        manager = file_patterns('helpers', self.path, strict=True).manager
+        self.assertIsInstance(
+            manager.get('more', 'helpers').manager, StrictManager,
+        )
+
+    def test_flattened(self):
+        message = self._broken(
+            '{"namespace": "b.inner", "label": "x", "path": "math.e"}',
+        )
+        self.assertIn('outer.inner and b.inner', message)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+# pylint: disable-msg=e0611
+'''appspace lifetime tests'''
+
+import threading
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+
+class Thing(object):
+
+    '''test component'''
+
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestLifetimes(unittest.TestCase):
+
+    @staticmethod
+    def _make_multiple():
+        from appspace import patterns
+        return patterns(
+            'helpers',
+            ('single', 'appspace.tests.test_lifetimes.Thing',
+                {'lifetime': 'singleton'}),
+            ('local', 'appspace.tests.test_lifetimes.Thing',
+                {'lifetime': 'thread'}),
+            ('context', 'appspace.tests.test_lifetimes.Thing',
+                {'lifetime': 'context'}),
+            ('fresh', Thing, {'lifetime': 'transient'}),
+            ('pooled', Thing, {'lifetime': 'pool', 'size': 2}),
+        )
+
+    def test_singleton(self):
+        plug = self._make_multiple()
+        self.assertIsInstance(plug.single, Thing)
+        self.assertIs(plug.single, plug['single'])
+
+    def test_transient(self):
+        plug = self._make_multiple()
+        self.assertIsInstance(plug.fresh, Thing)
+        self.assertIsNot(plug.fresh, plug.fresh)
+
+    def test_thread(self):
+        plug = self._make_multiple()
+        self.assertIs(plug.local, plug.local)
+        other = []
+        thread = threading.Thread(target=lambda: other.append(plug.local))
+        thread.start()
+        thread.join()
+        self.assertIsInstance(other[0], Thing)
+        self.assertIsNot(other[0], plug.local)
+
+    def test_context(self):
+        import contextvars
+        plug = self._make_multiple()
+        self.assertIs(plug.context, plug.context)
+        other = contextvars.Context().run(lambda: plug.context)
+        self.assertIsNot(other, plug.context)
+
+    def test_context_released(self):
+        import gc
+        import weakref
+        from appspace.lifetimes import Context
+        instances = []
+        for _ in range(3):
+            instances.append(weakref.ref(Context(Thing).get()))
+        gc.collect()
+        # contexts never keep instances of dropped lifetimes alive
+        self.assertEqual([ref() for ref in instances], [None] * 3)
+
+    def test_pool(self):
+        from appspace.keys import PoolError
+        plug = self._make_multiple()
+        pool = plug.pooled
+        first = pool.checkout()
+        second = pool.checkout()
+        self.assertIsNot(first, second)
+        self.assertRaises(PoolError, pool.checkout, 0.01)
+        pool.checkin(first)
+        self.assertIs(pool.checkout(), first)
+        pool.checkin(second)
+        with pool.lease() as third:
+            self.assertIs(third, second)
+
+    def test_pool_double_checkin(self):
+        from appspace.keys import PoolError
+        from appspace.lifetimes import Pool
+        pool = Pool(Thing, size=2)
+        first = pool.checkout()
+        pool.checkin(first)
+        self.assertRaises(PoolError, pool.checkin, first)
+        self.assertRaises(PoolError, pool.checkin, Thing())
+        self.assertIs(pool.checkout(), first)
+        self.assertIsNot(pool.checkout(), first)
+
+    def test_pool_timeout(self):
+        import time
+        from appspace.keys import PoolError
+        from appspace.lifetimes import Pool
+        pool = Pool(Thing, size=1)
+        pool.checkout()
+        stop = threading.Event()
+
+        def wake():
+            # wakeups that find nothing free must not restart the wait
+            for _ in range(50):
+                if stop.wait(0.02):
+                    return
+                with pool._cond:
+                    pool._cond.notify_all()
+        thread = threading.Thread(target=wake)
+        thread.start()
+        began = time.time()
+        try:
+            self.assertRaises(PoolError, pool.checkout, 0.1)
+        finally:
+            stop.set()
+            thread.join()
+        self.assertLess(time.time() - began, 0.5)
+
+    def test_pool_idle(self):
+        from appspace.lifetimes import Pool
+        pool = Pool(Thing, size=1, idle=0, close='close')
+        first = pool.checkout()
+        pool.checkin(first)
+        self.assertTrue(first.closed)
+        self.assertIsNot(pool.checkout(), first)
+
+    def test_unknown(self):
+        from appspace import patterns
+        from appspace.keys import ConfigurationError
+        self.assertRaises(
+            ConfigurationError,
+            patterns, 'helpers', ('bad', Thing, {'lifetime': 'forever'}),
+        )
+        self.assertRaises(
+            ConfigurationError,
+            patterns, 'helpers', ('bad', Thing, {'forever': True}),
+        )
+
+    def test_class_patterns(self):
+        from appspace import Patterns, Component, class_patterns
+
+        class helpers(Patterns):  # @IgnorePep8
+            single = Component(
+                'appspace.tests.test_lifetimes.Thing', lifetime='singleton',
+            )
+        plug = class_patterns(helpers)
+        self.assertIsInstance(plug.single, Thing)
+        self.assertIs(plug.single, plug.single)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,782 @@
+# -*- coding: utf-8 -*-
+# pylint: disable-msg=e0611
+'''appspace manager tests'''
+
+import sys
+import threading
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+from appspace import NoAppError
+
+
+class Thing(object):
+
+    '''test component'''
+
+    closed = False
+
+    def __call__(self):
+        return self
+
+
+def _make_multiple():
+    from math import fabs
+    from appspace import Patterns, Namespace, class_patterns
+    class helpers(Patterns): #@IgnorePep8
+        square = 'math.sqrt'
+        fabulous = fabs
+        class subhelpers(Namespace): #@IgnorePep8
+            square = 'math.exp'
+            mrk = 'math.isinf'
+    return class_patterns(helpers)
+
+
+class TestUsing(unittest.TestCase):
+
+    def test_using(self):
+        from math import sqrt, exp, isinf
+        plug = _make_multiple()
+        with plug.manager.using('subhelpers'):
+            self.assertIs(plug.square, exp)
+            self.assertIs(plug.mrk, isinf)
+            self.assertIs(plug.square, exp)
+        self.assertIs(plug.square, sqrt)
+        self.assertRaises(NoAppError, lambda: plug.mrk)
+
+    def test_failed_hop_resets(self):
+        from math import sqrt
+        plug = _make_multiple()
+        self.assertRaises(NoAppError, lambda: plug.subhelpers.missing)
+        self.assertIs(plug.square, sqrt)
+
+    def test_using_unknown(self):
+        from appspace import AppLookupError
+        plug = _make_multiple()
+        def using():
+            with plug.manager.using('nothelpers'):
+                pass
+        self.assertRaises(AppLookupError, using)
+
+    def test_using_threads(self):
+        from math import sqrt, exp
+        plug = _make_multiple()
+        barrier = threading.Barrier(2)
+        results = {}
+        def work(label, expected):
+            with plug.manager.using(label):
+                barrier.wait()
+                results[label] = all(
+                    plug.square is expected for _ in range(1000)
+                )
+        threads = [
+            threading.Thread(target=work, args=('helpers', sqrt)),
+            threading.Thread(target=work, args=('subhelpers', exp)),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, {'helpers': True, 'subhelpers': True})
+
+    def test_using_released(self):
+        import gc
+        import weakref
+        plug = _make_multiple()
+        with plug.manager.using('subhelpers'):
+            plug.square
+        plug.subhelpers.square
+        manager = weakref.ref(plug.manager)
+        del plug
+        gc.collect()
+        self.assertIsNone(manager())
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'needs asyncio.run')
+    def test_using_tasks(self):
+        import asyncio
+        from math import sqrt, exp
+        from appspace.tests.coroutines import using
+        plug = _make_multiple()
+        self.assertEqual(
+            asyncio.run(using(plug, ['subhelpers', 'helpers'])), [exp, sqrt],
+        )
+
+
+class TestNotify(unittest.TestCase):
+
+    @staticmethod
+    def _make_one():
+        from appspace.keys import AApp
+        from appspace.managers import Manager
+        manager = Manager('helpers')
+        seen = []
+        manager.ez_subscribe(AApp, 'flush', lambda e: seen.append(('a', e)))
+        manager.ez_subscribe(AApp, 'flush', lambda e: seen.append(('b', e)))
+        return manager, seen
+
+    def test_notify(self):
+        from appspace.keys import AApp
+        manager, seen = self._make_one()
+        manager.notify(AApp, 'flush', 1)
+        self.assertEqual(seen, [('a', 1), ('b', 1)])
+        manager.notify(AApp, 'nothing', 1)
+        self.assertEqual(len(seen), 2)
+
+    def test_notify_many(self):
+        from appspace.keys import AApp
+        manager, seen = self._make_one()
+        manager.notify_many(AApp, 'flush', [1, 2])
+        self.assertEqual(seen, [('a', 1), ('b', 1), ('a', 2), ('b', 2)])
+
+    def test_notify_invalidated(self):
+        from appspace.keys import AApp
+        manager, seen = self._make_one()
+        manager.notify(AApp, 'flush', 1)
+        manager.ez_subscribe(AApp, 'flush', lambda e: seen.append(('c', e)))
+        manager.notify(AApp, 'flush', 2)
+        self.assertEqual(seen[-3:], [('a', 2), ('b', 2), ('c', 2)])
+        manager.ez_unsubscribe(AApp, 'flush')
+        manager.notify(AApp, 'flush', 3)
+        self.assertEqual(len(seen), 5)
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'needs asyncio.run')
+    def test_anotify(self):
+        import asyncio
+        from appspace.keys import AApp
+        from appspace.tests.coroutines import awaited, doubler
+        manager, seen = self._make_one()
+        manager.ez_subscribe(AApp, 'flush', doubler(seen))
+        self.assertEqual(asyncio.run(awaited(
+            lambda: manager.anotify(AApp, 'flush', 2)
+        )), [None, None, 4])
+        self.assertEqual(sorted(seen), [('a', 2), ('b', 2), ('c', 2)])
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'needs asyncio.run')
+    def test_anotify_blocking(self):
+        import time
+        import asyncio
+        from appspace.keys import AApp
+        from appspace.tests.coroutines import awaited, doubler
+        manager, seen = self._make_one()
+        manager.ez_subscribe(AApp, 'slow', lambda e: time.sleep(0.2))
+        manager.ez_subscribe(AApp, 'slow', doubler(seen))
+        began = time.perf_counter()
+
+        def deliver():
+            # delivery returns before slow subscriber finishes
+            gathered = manager.anotify(AApp, 'slow', 1)
+            seen.append(('sent', time.perf_counter() - began))
+            return gathered
+        self.assertEqual(asyncio.run(awaited(deliver)), [None, 2])
+        self.assertLess(seen[0][1], 0.1)
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'needs asyncio.run')
+    def test_anotify_raises(self):
+        import asyncio
+        from appspace.keys import AApp
+        from appspace.tests.coroutines import awaited, doubler
+        manager, seen = self._make_one()
+        manager.ez_subscribe(AApp, 'flush', doubler(seen))
+        manager.ez_subscribe(AApp, 'flush', lambda e: 1 / 0)
+        with self.assertRaises(ZeroDivisionError):
+            asyncio.run(awaited(lambda: manager.anotify(AApp, 'flush', 2)))
+        # coroutine subscriber still ran
+        self.assertIn(('c', 2), seen)
+
+
+class TestPrepare(unittest.TestCase):
+
+    def test_preload(self):
+        from math import isinf
+        from appspace.keys import ALazyLoad
+        plug = _make_multiple()
+        manager = plug.manager
+        manager.preload('subhelpers')
+        key = manager.namespace('subhelpers')
+        self.assertIs(manager.lookup1(key, key, 'mrk'), isinf)
+        self.assertTrue(
+            manager.keyed(ALazyLoad, manager.lookup1(
+                manager._key, manager._key, 'square',
+            ))
+        )
+
+    def test_prepare_for_fork(self):
+        import gc
+        from math import sqrt, isinf
+        from appspace.keys import ALazyLoad
+        plug = _make_multiple()
+        manager = plug.manager
+        manager.set('appspace.tests.apps.appconf', 'misc')
+        fast = plug.compile()
+        manager.prepare_for_fork()
+        if hasattr(gc, 'unfreeze'):
+            gc.unfreeze()
+        for _, _, thing in manager.registrations():
+            self.assertFalse(manager.keyed(ALazyLoad, thing))
+        for _, _, thing in plug.misc.manager.registrations():
+            self.assertFalse(manager.keyed(ALazyLoad, thing))
+        self.assertIs(plug.square, sqrt)
+        self.assertIs(plug.subhelpers.mrk, isinf)
+        self.assertIs(vars(type(fast))['square'], sqrt)
+
+    def test_compact(self):
+        from math import sqrt
+        plug = _make_multiple()
+        manager = plug.manager
+        manager.compact()
+        self.assertIs(plug.square, sqrt)
+        manager.set('math.exp', 'square')
+        self.assertIsNot(plug.square, sqrt)
+
+
+class TestOverlay(unittest.TestCase):
+
+    def test_fall_through(self):
+        from math import sqrt, fabs, isinf
+        plug = _make_multiple()
+        tenant = plug.overlay('tenant')
+        self.assertIs(tenant.square, sqrt)
+        self.assertIs(tenant.fabulous, fabs)
+        self.assertIs(tenant.subhelpers.mrk, isinf)
+        self.assertIs(tenant.helpers.square, sqrt)
+
+    def test_copy_on_write(self):
+        from math import sqrt, exp, isnan
+        plug = _make_multiple()
+        tenant = plug.overlay('tenant')
+        tenant.manager.set('math.exp', 'square')
+        tenant.manager.set('math.isnan', 'mrk', 'subhelpers')
+        self.assertIs(tenant.square, exp)
+        self.assertIs(tenant.subhelpers.mrk, isnan)
+        self.assertIs(plug.square, sqrt)
+        self.assertIsNot(plug.subhelpers.mrk, isnan)
+
+    def test_parent_changes(self):
+        from math import exp, ceil
+        plug = _make_multiple()
+        tenant = plug.overlay('tenant')
+        tenant.square
+        plug.manager.set('math.exp', 'square')
+        plug.manager.set('math.ceil', 'newer')
+        self.assertIs(tenant.square, exp)
+        self.assertIs(tenant.newer, ceil)
+
+    def test_lazy_loads_into_parent(self):
+        from math import sqrt
+        plug = _make_multiple()
+        manager = plug.manager
+        plug.overlay('tenant').square
+        self.assertIs(manager.registered(
+            [manager._key], manager._key, 'square',
+        ), sqrt)
+
+    def test_compile_loads_into_parent(self):
+        from math import sqrt, exp
+        plug = _make_multiple()
+        manager = plug.manager
+        tenant = plug.overlay('tenant')
+        self.assertIs(tenant.compile().square, sqrt)
+        self.assertIsNone(tenant.manager.registered(
+            [manager._key], manager._key, 'square',
+        ))
+        manager.set(exp, 'square')
+        self.assertIs(tenant.square, exp)
+
+    def test_memo(self):
+        from appspace import patterns
+        calls = []
+        def double(x):
+            calls.append(x)
+            return x * 2
+        plug = patterns('helpers', ('double', double, {'cache': 8}))
+        tenant = plug.overlay('tenant')
+        self.assertEqual(tenant('double', 2), 4)
+        self.assertEqual(plug('double', 2), 4)
+        self.assertEqual(calls, [2])
+        tenant.manager.set(lambda x: x * 3, 'double')
+        self.assertEqual(tenant('double', 2), 6)
+        self.assertEqual(plug('double', 2), 4)
+
+    def test_cost(self):
+        from appspace.keys import ANamespace
+        plug = _make_multiple()
+        tenant = plug.overlay('tenant').manager
+        self.assertEqual(
+            [label for _, label, _ in tenant.registrations()],
+            ['tenant', 'tenant'],
+        )
+        self.assertIsNone(tenant.registered([ANamespace], ANamespace, 'helpers'))
+
+
+class TestMemoryReport(unittest.TestCase):
+
+    def test_memory_report(self):
+        import sys
+        import tracemalloc
+        from appspace import patterns
+        sys.modules.pop('appspace.tests.heavy', None)
+        tracing = tracemalloc.is_tracing()
+        plug = patterns(
+            'helpers',
+            ('heavy', 'appspace.tests.heavy.BLOB'),
+            ('square', 'math.sqrt'),
+            ('lazy', 'math.fabs'),
+        )
+        plug.manager.trace_memory()
+        try:
+            plug.heavy
+            plug.square
+        finally:
+            plug.manager.trace_memory(False)
+            if not tracing:
+                tracemalloc.stop()
+        report = plug.manager.memory_report()
+        self.assertEqual(list(report), ['helpers'])
+        heavy, square, lazy = report['helpers']
+        self.assertEqual(
+            (heavy.label, square.label, lazy.label),
+            ('heavy', 'square', 'lazy'),
+        )
+        self.assertGreater(heavy.loaded, 1 << 20)
+        self.assertGreater(heavy.retained, 1 << 20)
+        self.assertLess(square.retained, 1 << 12)
+        self.assertTrue(lazy.lazy)
+        self.assertIsNone(lazy.loaded)
+        by_loaded = plug.manager.memory_report('loaded')['helpers']
+        self.assertEqual(by_loaded[0].label, 'heavy')
+
+    def test_grouped(self):
+        plug = _make_multiple()
+        plug.subhelpers.mrk
+        report = plug.manager.memory_report()
+        self.assertEqual(sorted(report), ['helpers', 'subhelpers'])
+        self.assertEqual(
+            sorted(f.label for f in report['subhelpers']), ['mrk', 'square'],
+        )
+
+    def test_not_module(self):
+        plug = _make_multiple()
+        plug.square
+        # some packages put objects without globals in sys.modules
+        sys.modules['appspace.tests.notmodule'] = object()
+        try:
+            report = plug.manager.memory_report()
+        finally:
+            del sys.modules['appspace.tests.notmodule']
+        self.assertIn('helpers', report)
+
+
+class TestSnapshots(unittest.TestCase):
+
+    def test_published(self):
+        from math import sqrt, pow
+        from appspace.registry import _Cell, _missing
+        plug = _make_multiple()
+        manager = plug.manager
+        key = manager._key
+        things = manager._snapshot[key]
+        manager.set('math.pow', 'power', 'helpers')
+        # publishing writes in place instead of copying
+        self.assertIs(manager._snapshot[key], things)
+        self.assertIn('power', things)
+        # changes of a publish in progress stay hidden until it finishes
+        version = manager._version
+        things['square'] = _Cell(version + 1, pow, sqrt)
+        things['fresh'] = _Cell(version + 1, pow, _missing)
+        self.assertIs(manager._find(key, 'square'), sqrt)
+        self.assertIsNone(manager._find(key, 'fresh'))
+        manager._version += 1
+        self.assertIs(manager._find(key, 'square'), pow)
+        self.assertIs(manager._find(key, 'fresh'), pow)
+
+    def test_batch(self):
+        from math import pow
+        from appspace import AppLookupError
+        manager = _make_multiple().manager
+        seen = []
+        lookup = lambda: seen.append(manager._find(manager._key, 'power'))
+        with manager.batch():
+            manager.set('math.pow', 'power', 'helpers')
+            # batching thread sees its own changes
+            self.assertIs(manager.get('power', 'helpers'), pow)
+            thread = threading.Thread(target=lookup)
+            thread.start()
+            thread.join()
+            self.assertEqual(seen, [None])
+            manager.ez_unregister(manager._key, 'square')
+        self.assertIs(manager.get('power', 'helpers'), pow)
+        self.assertRaises(AppLookupError, manager.get, 'square', 'helpers')
+
+    def test_churn(self):
+        from math import sqrt, fabs
+        from appspace import AppLookupError
+        plug = _make_multiple()
+        manager = plug.manager
+        stop = threading.Event()
+        errors = []
+
+        def write(n):
+            label = 'churn{0}'.format(n % 4)
+            while not stop.is_set():
+                manager.set('math.floor', label, 'helpers')
+                manager.set('math.ceil', label, 'subhelpers')
+                manager.ez_unregister(manager._key, label)
+
+        def read():
+            from math import floor, ceil
+            while not stop.is_set():
+                try:
+                    if manager.get('square', 'helpers') is not sqrt:
+                        errors.append('square')
+                    if manager.get('fabulous', 'helpers') is not fabs:
+                        errors.append('fabulous')
+                    for n in range(4):
+                        label = 'churn{0}'.format(n)
+                        try:
+                            if manager.get(label, 'helpers') is not floor:
+                                errors.append(label)
+                        except AppLookupError:
+                            pass
+                        try:
+                            if manager.get(label, 'subhelpers') is not ceil:
+                                errors.append(label)
+                        except AppLookupError:
+                            pass
+                except Exception as exc:
+                    errors.append(exc)
+        threads = [
+            threading.Thread(target=write, args=(n,)) for n in range(4)
+        ] + [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        stop.wait(0.5)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertIs(plug.square, sqrt)
+
+    def test_lazy_replaced(self):
+        from math import floor, ceil
+        plug = _make_multiple()
+        manager = plug.manager
+        key = manager.namespace('helpers')
+        manager.set('math.floor', 'rounding', 'helpers')
+        stale = manager.registered([key], key, 'rounding')
+        manager.set('math.ceil', 'rounding', 'helpers')
+        # loading a replaced lazy thing keeps the newer registration
+        self.assertIs(manager._unlazy('rounding', key, stale), ceil)
+        self.assertIs(manager.registered([key], key, 'rounding'), ceil)
+        self.assertIsNot(manager.get('rounding', 'helpers'), floor)
+
+    def test_lazy_churn(self):
+        from math import ceil
+        plug = _make_multiple()
+        manager = plug.manager
+        stop = threading.Event()
+
+        def read():
+            while not stop.is_set():
+                try:
+                    manager.get('rounding', 'helpers')
+                except Exception:
+                    pass
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        stale = []
+        try:
+            for _ in range(200):
+                manager.set('math.floor', 'rounding', 'helpers')
+                manager.set('math.ceil', 'rounding', 'helpers')
+                # readers may still be loading floor but must not win
+                if manager.get('rounding', 'helpers') is not ceil:
+                    stale.append(True)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(stale, [])
+
+
+class TestSearch(unittest.TestCase):
+
+    def test_glob(self):
+        manager = _make_multiple().manager
+        self.assertEqual(
+            manager.glob('helpers.*'),
+            [('helpers', 'fabulous'), ('helpers', 'square')],
+        )
+        self.assertEqual(
+            manager.glob('*.square'),
+            [('helpers', 'square'), ('subhelpers', 'square')],
+        )
+        self.assertEqual(manager.glob('m?k'), [('subhelpers', 'mrk')])
+        self.assertEqual(manager.glob('nothing.*'), [])
+
+    def test_prefix(self):
+        manager = _make_multiple().manager
+        self.assertEqual(
+            manager.prefix('squ'),
+            [('helpers', 'square'), ('subhelpers', 'square')],
+        )
+        self.assertEqual(manager.prefix('x'), [])
+
+    def test_maintained(self):
+        manager = _make_multiple().manager
+        manager.prefix('')
+        manager.set('math.floor', 'fmt_floor', 'subhelpers')
+        manager.set('math.ceil', 'fmt_ceil', 'helpers')
+        self.assertEqual(
+            manager.prefix('fmt_'),
+            [('helpers', 'fmt_ceil'), ('subhelpers', 'fmt_floor')],
+        )
+        manager.ez_unregister(manager.namespace('subhelpers'), 'fmt_floor')
+        self.assertEqual(manager.prefix('fmt_'), [('helpers', 'fmt_ceil')])
+        # bulk changes are merged into index
+        with manager.batch():
+            for n in range(100):
+                manager.set('math.floor', 'fmt_{0}'.format(n), 'subhelpers')
+        self.assertEqual(len(manager.glob('subhelpers.fmt_*')), 100)
+        # new namespaces rebuild index
+        from appspace.keys import ANamespace
+        manager.key(ANamespace, 'other')
+        manager.set('math.ceil', 'fmt_other', 'other')
+        self.assertEqual(len(manager.prefix('fmt_')), 102)
+
+    def test_overlay_inherited(self):
+        manager = _make_multiple().manager
+        overlay = manager.overlay('local')
+        overlay.prefix('')
+        overlay.set('math.floor', 'newlabel', 'subhelpers')
+        self.assertIn(('subhelpers', 'newlabel'), overlay.glob('subhelpers.*'))
+        self.assertEqual(overlay.prefix('newl'), [('subhelpers', 'newlabel')])
+        # unindexed overlays resolve inherited namespaces when built
+        other = manager.overlay('other')
+        other.set('math.ceil', 'newlabel', 'subhelpers')
+        self.assertEqual(other.prefix('newl'), [('subhelpers', 'newlabel')])
+        self.assertEqual(manager.prefix('newl'), [])
+
+    def test_select(self):
+        from math import sqrt, exp
+        plug = _make_multiple()
+        self.assertEqual(
+            list(plug.select('*.square').items()),
+            [('helpers.square', sqrt), ('subhelpers.square', exp)],
+        )
+
+    def test_overlay(self):
+        manager = _make_multiple().manager
+        overlay = manager.overlay('child')
+        overlay.set('math.floor', 'squash', 'child')
+        self.assertEqual(
+            overlay.prefix('squ'), [
+                ('child', 'squash'), ('helpers', 'square'),
+                ('subhelpers', 'square'),
+            ],
+        )
+
+
+class TestPaths(unittest.TestCase):
+
+    @staticmethod
+    def _make_branched():
+        from appspace import patterns, include
+        return patterns(
+            'helpers',
+            ('misc', include('appspace.tests.apps.appconf')),
+            ('fresh', 'appspace.tests.test_managers.Thing',
+                {'lifetime': 'transient'}),
+        )
+
+    def test_get_path(self):
+        from math import sqrt, exp, isinf
+        manager = _make_multiple().manager
+        self.assertIs(manager.get_path('square'), sqrt)
+        self.assertIs(manager.get_path('subhelpers.square'), exp)
+        self.assertEqual(manager.get_path('square.__name__'), 'sqrt')
+        self.assertIs(manager.get_path('subhelpers').mrk, isinf)
+        self.assertIs(manager.get_path('square', 'subhelpers'), exp)
+
+    def test_branch(self):
+        from math import exp
+        manager = self._make_branched().manager
+        self.assertIs(manager.get_path('misc.mrnrf'), exp)
+        self.assertEqual(manager.get_path('misc.mrnrf.__name__'), 'exp')
+
+    def test_lookup_error(self):
+        from appspace import AppLookupError
+        manager = self._make_branched().manager
+        self.assertRaises(AppLookupError, manager.get_path, 'nothing.here')
+        self.assertRaises(AppLookupError, manager.get_path, 'misc.nothing')
+        self.assertRaises(
+            AppLookupError, manager.get_path, 'misc.square.nothing',
+        )
+
+    def test_invalidated(self):
+        from math import floor, ceil
+        manager = self._make_branched().manager
+        manager.get_path('misc.square')
+        branch = manager.get_path('misc').manager
+        branch.set('math.floor', 'square')
+        self.assertIs(manager.get_path('misc.square'), floor)
+        manager.set('math.ceil', 'misc')
+        self.assertIs(manager.get_path('misc'), ceil)
+
+    def test_resolver(self):
+        from math import exp, floor
+        manager = _make_multiple().manager
+        resolve = manager.resolver('subhelpers.square')
+        self.assertIs(resolve(), exp)
+        self.assertIs(resolve(), exp)
+        manager.set('math.floor', 'square', 'subhelpers')
+        self.assertIs(resolve(), floor)
+
+    def test_lazy_load_keeps_routes(self):
+        from math import sqrt, isinf
+        plug = _make_multiple()
+        manager = plug.manager
+        proxy = plug.compile()
+        self.assertIs(proxy.square, sqrt)
+        compiled = type(proxy)
+        resolve = manager.resolver('square')
+        self.assertIs(manager.get_path('square'), sqrt)
+        route = manager._routes[(False, 'square')]
+        generation = manager._generation
+        # loading an unrelated lazy thing changes no lookup result
+        self.assertIs(manager.get('mrk', 'subhelpers'), isinf)
+        self.assertEqual(manager._generation, generation)
+        self.assertIs(manager.get_path('square'), sqrt)
+        self.assertIs(manager._routes[(False, 'square')], route)
+        self.assertIs(resolve(), sqrt)
+        self.assertIs(type(proxy), compiled)
+        manager.set('math.floor', 'square')
+        self.assertNotEqual(manager._generation, generation)
+
+    def test_lifetime(self):
+        manager = self._make_branched().manager
+        self.assertIsNot(manager.get_path('fresh'), manager.get_path('fresh'))
+        resolve = manager.resolver('fresh.closed')
+        self.assertFalse(resolve())
+
+
+class TestPartial(unittest.TestCase):
+
+    def test_callable(self):
+        from math import pow
+        manager = _make_multiple().manager
+        self.assertEqual(manager.partial(pow, False, 2)(3), 8)
+
+    def test_label(self):
+        manager = _make_multiple().manager
+        square = manager.partial('square', False, 16)
+        self.assertEqual(square(), 4)
+        exp = manager.partial('square', 'subhelpers')
+        self.assertEqual(exp(0), 1)
+        self.assertEqual(manager.partial('subhelpers.square')(0), 1)
+
+    def test_rebound(self):
+        manager = _make_multiple().manager
+        call = manager.partial('square', 'subhelpers', 2.5)
+        self.assertEqual(call(), manager.get('square', 'subhelpers')(2.5))
+        manager.set('math.floor', 'square', 'subhelpers')
+        self.assertEqual(call(), 2)
+
+    def test_memo(self):
+        from appspace import Component
+        manager = _make_multiple().manager
+        manager.set(Component('math.sqrt', cache=True), 'root', 'subhelpers')
+        root = manager.partial('root', 'subhelpers')
+        root(4)
+        root(4)
+        self.assertEqual(manager.cache_info('root', 'subhelpers').hits, 1)
+
+    def test_memo_path(self):
+        from appspace import Component
+        from appspace.keys import ANamespace
+        manager = _make_multiple().manager
+        manager.key(ANamespace, 'a')
+        manager.key(ANamespace, 'b')
+        manager.set(Component('math.sqrt', cache=True), 'sq', 'b')
+        sq = manager.partial('a.b.sq')
+        sq(4)
+        sq(4)
+        self.assertEqual(manager.cache_info('sq', 'b').hits, 1)
+
+    def test_lifetime(self):
+        from appspace import patterns
+        manager = patterns('helpers', (
+            'fresh', 'appspace.tests.test_managers.Thing',
+            {'lifetime': 'transient'},
+        )).manager
+        fresh = manager.partial('fresh')
+        self.assertIsNot(fresh(), fresh())
+
+
+class TestTeardown(unittest.TestCase):
+
+    @staticmethod
+    def _make_explosive():
+        from appspace import patterns
+        plug = patterns(
+            'helpers',
+            ('square', 'math.sqrt'),
+            ('boom', 'appspace.tests.explode.anything'),
+        )
+        manager = plug.manager
+        from appspace.keys import ANamespace
+        manager.key(ANamespace, 'tenant')
+        manager.set('appspace.tests.explode.anything', 'boom', 'tenant')
+        manager.set('math.exp', 'exp', 'tenant')
+        return plug
+
+    def test_ez_unregister(self):
+        import sys
+        from appspace import AppLookupError
+        manager = self._make_explosive().manager
+        manager.ez_unregister(manager._key, 'boom')
+        self.assertRaises(AppLookupError, manager.get, 'boom', 'helpers')
+        self.assertNotIn('appspace.tests.explode', sys.modules)
+
+    def test_unregister_many(self):
+        import sys
+        from math import sqrt
+        from appspace import AppLookupError
+        manager = self._make_explosive().manager
+        overlay = manager.overlay('child')
+        notified = []
+        changed = overlay.changed
+        overlay.changed = lambda x: (notified.append(x), changed(x))
+        manager.unregister_many(['boom', 'exp'], 'tenant')
+        self.assertEqual(len(notified), 1)
+        self.assertRaises(AppLookupError, manager.get, 'boom', 'tenant')
+        self.assertRaises(AppLookupError, manager.get, 'exp', 'tenant')
+        self.assertIs(manager.get('square', 'helpers'), sqrt)
+        self.assertNotIn('appspace.tests.explode', sys.modules)
+
+    def test_drop_namespace(self):
+        import sys
+        from math import sqrt
+        from appspace import AppLookupError
+        from appspace.keys import ConfigurationError
+        plug = self._make_explosive()
+        manager = plug.manager
+        self.assertEqual(len(manager.glob('tenant.*')), 2)
+        proxy = manager.compile('tenant')
+        manager.drop_namespace('tenant')
+        self.assertRaises(AppLookupError, manager.namespace, 'tenant')
+        self.assertRaises(NoAppError, lambda: plug.tenant)
+        self.assertRaises(NoAppError, lambda: proxy.exp)
+        self.assertEqual(manager.glob('tenant.*'), [])
+        self.assertIs(plug.square, sqrt)
+        self.assertNotIn('appspace.tests.explode', sys.modules)
+        self.assertRaises(
+            ConfigurationError, manager.drop_namespace, 'helpers',
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+# pylint: disable-msg=e0611
+'''appspace memoization tests'''
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+CALLS = []
+
+
+def square(x):
+    CALLS.append(x)
+    return x * x
+
+
+class TestMemo(unittest.TestCase):
+
+    def setUp(self):
+        del CALLS[:]
+
+    @staticmethod
+    def _make_multiple():
+        from appspace import patterns
+        return patterns(
+            'helpers',
+            ('square', 'appspace.tests.test_memo.square', {'cache': 2}),
+            ('plain', square),
+        )
+
+    def test_call(self):
+        plug = self._make_multiple()
+        self.assertEqual(plug('square', 3), 9)
+        self.assertEqual(plug('square', 3), 9)
+        self.assertEqual(plug.manager.apply('square', 'helpers', 3), 9)
+        self.assertEqual(CALLS, [3])
+        info = plug.manager.cache_info('square')
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 1, 1))
+
+    def test_uncached(self):
+        plug = self._make_multiple()
+        plug('plain', 3)
+        plug('plain', 3)
+        self.assertEqual(CALLS, [3, 3])
+
+    def test_bounded(self):
+        plug = self._make_multiple()
+        for x in (1, 2, 3, 1):
+            plug('square', x)
+        self.assertEqual(CALLS, [1, 2, 3, 1])
+        self.assertEqual(plug.manager.cache_info('square').currsize, 2)
+        plug.manager.cache_clear('square')
+        self.assertEqual(plug.manager.cache_info('square').currsize, 0)
+
+    def test_keywords(self):
+        from appspace.memo import Memo
+        cached = Memo()
+        call = lambda *args, **kw: (args, kw)
+        self.assertEqual(cached(call, (1,), {'b': 2, 'a': 1}), (
+            (1,), {'a': 1, 'b': 2},
+        ))
+        self.assertEqual(cached(call, (1,), {'a': 1, 'b': 2}), (
+            (1,), {'a': 1, 'b': 2},
+        ))
+        self.assertEqual(cached.info().hits, 1)
+        # positional arguments never collide with keyword arguments
+        kwargs = ((1,), frozenset([('a', 1)]))
+        self.assertEqual(cached(call, kwargs, {}), (kwargs, {}))
+        self.assertEqual(cached(call, (1,), {'a': 1}), ((1,), {'a': 1}))
+        self.assertEqual(cached(call, (1, ('a', 1)), {}), (
+            (1, ('a', 1)), {},
+        ))
+
+    def test_ttl(self):
+        from appspace import patterns
+        plug = patterns(
+            'helpers', ('square', square, {'cache': {'ttl': 0}}),
+        )
+        plug('square', 3)
+        plug('square', 3)
+        self.assertEqual(CALLS, [3, 3])
+
+    def test_reregister(self):
+        plug = self._make_multiple()
+        plug('square', 3)
+        plug.manager.set(lambda x: -x, 'square', cache=True)
+        self.assertEqual(plug('square', 3), -3)
+        plug.manager.set(square, 'square')
+        self.assertRaises(KeyError, plug.manager.cache_info, 'square')
+
+    def test_class_patterns(self):
+        from appspace import Patterns, Namespace, Component, class_patterns
+
+        class helpers(Patterns):  # @IgnorePep8
+            class subhelpers(Namespace):  # @IgnorePep8
+                square = Component(square, cache=8)
+        plug = class_patterns(helpers)
+        self.assertEqual(plug.subhelpers('square', 3), 9)
+        self.assertEqual(plug.compile().subhelpers('square', 3), 9)
+        self.assertEqual(CALLS, [3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# pylint: disable-msg=e0611
+'''appspace compiled proxy tests'''
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+from appspace import NoAppError
+
+
+def function(x):
+    return x
+
+
+class TestCompiled(unittest.TestCase):
+
+    @staticmethod
+    def _make_multiple():
+        from math import fabs
+        from appspace import Patterns, Namespace, Branch, class_patterns
+        class helpers(Patterns): #@IgnorePep8
+            square = 'math.sqrt'
+            fabulous = fabs
+            func = function
+            class subhelpers(Namespace): #@IgnorePep8
+                mrk = 'math.isinf'
+            class branched(Branch): #@IgnorePep8
+                misc = 'appspace.tests.apps.appconf'
+        return class_patterns(helpers)
+
+    def test_attr(self):
+        from math import sqrt, fabs, isinf, exp
+        plug = self._make_multiple()
+        fast = plug.compile()
+        self.assertIs(fast.square, sqrt)
+        self.assertIs(fast.fabulous, fabs)
+        self.assertIs(fast.func, function)
+        self.assertIs(fast.subhelpers.mrk, isinf)
+        self.assertIs(fast.misc.mrnrf, exp)
+        self.assertIs(fast['square'], sqrt)
+        self.assertEqual(fast('square', 4), 2)
+        self.assertRaises(NoAppError, lambda: fast.nothing)
+
+    def test_plain_attributes(self):
+        from math import sqrt
+        plug = self._make_multiple()
+        fast = plug.compile()
+        fast.square
+        self.assertIs(vars(type(fast))['square'], sqrt)
+        self.assertEqual(type(fast).__dictoffset__, 0)
+
+    def test_regenerate(self):
+        from math import sqrt, exp
+        plug = self._make_multiple()
+        fast = plug.compile()
+        self.assertIs(fast.square, sqrt)
+        plug.manager.set('math.exp', 'square')
+        plug.manager.set('math.sqrt', 'root')
+        self.assertIs(fast.square, exp)
+        self.assertIs(fast.root, sqrt)
+        self.assertIs(plug.compile(), fast)
+
+    def test_lifetime(self):
+        from appspace import patterns
+        plug = patterns('helpers', ('fresh', object, {'lifetime': 'transient'}))
+        fast = plug.compile()
+        self.assertIsNot(fast.fresh, fast.fresh)
+
+
+if __name__ == '__main__':
+    unittest.main()
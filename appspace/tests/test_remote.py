@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# pylint: disable-msg=e0611
+'''appspace remote component tests'''
+
+import os
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+
+class TestRemote(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        from appspace.remote import Worker
+        cls.worker = Worker(size=2, window=4)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.worker.close()
+
+    def _make_multiple(self):
+        from appspace import patterns
+        return patterns(
+            'helpers',
+            ('pid', 'os.getpid', {'remote': self.worker}),
+            ('square', 'math.sqrt', {'remote': self.worker}),
+            ('local', 'os.getpid'),
+        )
+
+    def test_call_in_worker(self):
+        plug = self._make_multiple()
+        self.assertEqual(plug.helpers.square(4), 2.0)
+        self.assertNotEqual(plug.helpers.pid(), os.getpid())
+        self.assertEqual(plug.helpers.pid(), self.worker.pid)
+        self.assertEqual(plug.helpers.local(), os.getpid())
+
+    def test_error(self):
+        plug = self._make_multiple()
+        self.assertRaises(ValueError, plug.helpers.square, -1)
+        # connection still usable after remote error
+        self.assertEqual(plug.helpers.square(9), 3.0)
+
+    def test_pooled_connections(self):
+        plug = self._make_multiple()
+        for _ in range(10):
+            plug.helpers.square(1)
+        self.assertLessEqual(self.worker._pool._count, 2)
+
+    def test_pipeline(self):
+        square = self._make_multiple().helpers.square
+        self.assertEqual(
+            square.pipeline(range(20)), [i ** 0.5 for i in range(20)],
+        )
+        self.assertRaises(ValueError, square.pipeline, [1, -1, 4])
+        self.assertEqual(square(16), 4.0)
+
+    def test_batch(self):
+        square = self._make_multiple().helpers.square
+        self.assertEqual(square.map([1, 4, 9]), [1.0, 2.0, 3.0])
+        self.assertEqual(
+            self.worker.batch([
+                ('math.sqrt', (4,), None), ('math.pow', (2, 3), None),
+            ]),
+            [2.0, 8.0],
+        )
+        self.assertRaises(ValueError, square.map, [1, -1])
+
+    def test_restart(self):
+        import signal
+        from appspace.remote import Worker
+        worker = Worker(size=2)
+        try:
+            first = worker.call('os.getpid')
+            os.kill(first, signal.SIGKILL)
+            worker._process.join()
+            # calls over connections to the dead worker fail once
+            try:
+                worker.call('os.getpid')
+            except (EOFError, OSError):
+                pass
+            second = worker.call('os.getpid')
+            self.assertNotEqual(second, first)
+            self.assertEqual(second, worker.pid)
+        finally:
+            worker.close()
+
+    def test_default_worker(self):
+        from appspace import patterns
+        from appspace.remote import worker
+        plug = patterns('helpers', ('pid', 'os.getpid', {'remote': True}))
+        try:
+            self.assertEqual(plug.helpers.pid(), worker().pid)
+        finally:
+            worker().close()
+
+    def test_needs_path(self):
+        from appspace import patterns
+        from appspace.keys import ConfigurationError
+        self.assertRaises(
+            ConfigurationError, patterns, 'helpers',
+            ('pid', os.getpid, {'remote': True}),
+        )
+        self.assertRaises(
+            ConfigurationError, patterns, 'helpers',
+            ('pid', 'os.getpid', {
+                'remote': True, 'lifetime': 'bogus', 'typo': 1,
+            }),
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
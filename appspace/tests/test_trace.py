@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# pylint: disable-msg=e0611
+'''appspace build trace tests'''
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+
+def _helpers():
+    from math import fabs
+    from appspace import Patterns, Namespace, Branch
+    class helpers(Patterns): #@IgnorePep8
+        square = 'math.sqrt'
+        fabulous = fabs
+        class subhelpers(Namespace): #@IgnorePep8
+            square = 'math.exp'
+            mrk = 'math.isinf'
+            class deeper(Namespace): #@IgnorePep8
+                floor = 'math.floor'
+        class misc(Branch): #@IgnorePep8
+            apps = 'appspace.tests.apps.appconf'
+    return helpers
+
+
+class TestBuildTrace(unittest.TestCase):
+
+    def test_report(self):
+        from appspace import class_patterns
+        from appspace.trace import BuildTrace
+        with BuildTrace() as trace:
+            plug = class_patterns(_helpers())
+        self.assertEqual(plug.subhelpers.mrk.__name__, 'isinf')
+        stats = dict((s.name.rpartition('.')[-1], s) for s in trace.report())
+        self.assertEqual(
+            sorted(stats), ['deeper', 'helpers', 'misc', 'subhelpers'],
+        )
+        self.assertEqual(stats['helpers'].kind, 'patterns')
+        self.assertEqual(stats['subhelpers'].kind, 'namespace')
+        self.assertEqual(stats['misc'].kind, 'branch')
+        self.assertEqual(
+            [stats[n].entries for n in ('helpers', 'subhelpers', 'deeper')],
+            [2, 2, 1],
+        )
+        # nested builds are inside outer build time but not its own time
+        self.assertGreaterEqual(
+            stats['helpers'].seconds, stats['subhelpers'].seconds,
+        )
+        self.assertLess(
+            stats['helpers'].own, stats['helpers'].seconds,
+        )
+        self.assertEqual(trace.counts['create'], 3)
+        self.assertGreater(trace.counts['keyed'], 0)
+        # every entry normalizes its label
+        self.assertEqual(
+            trace.counts['safename'], sum(s.entries for s in trace.report()),
+        )
+        self.assertEqual(
+            [s.name for s in trace.report('name')],
+            sorted(s.name for s in trace.report()),
+        )
+        # counting never touches the manager
+        self.assertNotIn('set', vars(plug.manager))
+
+    def test_inactive(self):
+        import threading
+        from appspace import class_patterns
+        from appspace.trace import BuildTrace
+        built = []
+        with BuildTrace() as trace:
+            # builds in other execution contexts are not traced
+            thread = threading.Thread(
+                target=lambda: built.append(class_patterns(_helpers())),
+            )
+            thread.start()
+            thread.join()
+        self.assertEqual(len(built), 1)
+        self.assertEqual(trace.report(), [])
+        self.assertEqual(set(trace.counts.values()), set([0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+# pylint: disable-msg=e0611
+'''appspace utility tests'''
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+try:
+    from unittest import mock
+except ImportError:  # pragma: no cover
+    import mock
+
+
+class TestLazyImport(unittest.TestCase):
+
+    def setUp(self):
+        from appspace import utils
+        utils._imported.clear()
+
+    def test_lazyimport(self):
+        import os.path
+        from math import sqrt
+        from appspace.utils import lazyimport
+        self.assertIs(lazyimport('math.sqrt'), sqrt)
+        self.assertIs(lazyimport('math'), __import__('math'))
+        self.assertIs(lazyimport('os.path'), os.path)
+        self.assertIs(lazyimport('os', 'path'), os.path)
+        self.assertIs(lazyimport(sqrt), sqrt)
+        self.assertIs(lazyimport('os:path.join'), os.path.join)
+        self.assertIs(lazyimport('os.path:join'), os.path.join)
+        self.assertRaises(ImportError, lazyimport, 'os:path.missing')
+
+    def test_lazyimport_cached(self):
+        from math import sqrt
+        from appspace import utils
+        utils.lazyimport('math.sqrt')
+        with mock.patch.object(utils, 'import_module') as imported:
+            self.assertIs(utils.lazyimport('math.sqrt'), sqrt)
+        self.assertFalse(imported.called)
+
+    def test_lazyimport_patched(self):
+        import math
+        from appspace.utils import lazyimport, lazyimports
+        self.assertIs(lazyimport('math.sqrt'), math.sqrt)
+        with mock.patch('math.sqrt') as patched:
+            self.assertIs(lazyimport('math.sqrt'), patched)
+            self.assertIs(lazyimports(['math.sqrt'])['math.sqrt'], patched)
+        self.assertIs(lazyimport('math.sqrt'), math.sqrt)
+
+    def test_lazyimport_reloaded(self):
+        try:
+            from importlib import reload
+        except ImportError:  # pragma: no cover
+            from imp import reload
+        from appspace.utils import lazyimport
+        from appspace.tests import apps
+        before = lazyimport('appspace.tests.apps.PATTERNS')
+        self.assertIs(before, apps.PATTERNS)
+        reload(apps)
+        self.assertIsNot(apps.PATTERNS, before)
+        self.assertIs(lazyimport('appspace.tests.apps.PATTERNS'), apps.PATTERNS)
+
+    def test_lazyimports(self):
+        from math import sqrt, fabs
+        from appspace import utils
+        real = utils.import_module
+        with mock.patch.object(
+            utils, 'import_module', side_effect=real,
+        ) as imported:
+            loaded = utils.lazyimports(
+                ['math.sqrt', 'math.fabs', 're.match', 'math'],
+            )
+        self.assertIs(loaded['math.sqrt'], sqrt)
+        self.assertIs(loaded['math.fabs'], fabs)
+        self.assertIs(loaded['math'], real('math'))
+        self.assertEqual(
+            sorted(c[0][0] for c in imported.call_args_list),
+            ['math', 'math', 're'],
+        )
+
+    def test_preload(self):
+        from math import sqrt, exp
+        from appspace import utils, patterns
+        from appspace.tests.apps import PATTERNS
+        plug = patterns('helpers', *PATTERNS)
+        real = utils.import_module
+        with mock.patch.object(
+            utils, 'import_module', side_effect=real,
+        ) as imported:
+            plug.manager.preload()
+        self.assertEqual(
+            sorted(c[0][0] for c in imported.call_args_list), ['math', 're'],
+        )
+        key = plug.manager._key
+        self.assertIs(plug.manager.registered([key], key, 'square'), sqrt)
+        self.assertIs(plug.manager.registered([key], key, 'mrnrf'), exp)
+
+
+if __name__ == '__main__':
+    unittest.main()
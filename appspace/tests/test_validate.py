@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# pylint: disable-msg=e0611
+'''appspace validation tests'''
+
+import sys
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+
+class TestValidate(unittest.TestCase):
+
+    def test_valid(self):
+        from appspace import validate, include
+        self.assertEqual(validate(
+            'helpers',
+            ('square', 'math.sqrt'),
+            ('formit', 're.match'),
+            ('join', 'os.path.join'),
+            ('boom', 'appspace.tests.explode.thing'),
+            ('mod', 'appspace.tests.explode'),
+            ('chain', 'appspace.tests.explode:thing.attr'),
+            ('misc', include('appspace.tests.apps.appconf')),
+            static=True,
+        ), [])
+        self.assertNotIn('appspace.tests.explode', sys.modules)
+
+    def test_broken(self):
+        from appspace import validate
+        broken = validate(
+            'helpers',
+            ('square', 'math.sqrt'),
+            ('nomod', 'appspace.tests.nothing.thing'),
+            ('noattr', 'appspace.tests.explode.nothing'),
+            ('nopkg', 'nothing.thing'),
+        )
+        self.assertEqual(
+            sorted((b.label, b.reason) for b in broken),
+            [
+                ('nomod', 'no module appspace.tests.nothing'),
+                ('nopkg', 'no module nothing'),
+            ],
+        )
+        broken = validate(
+            'helpers', ('noattr', 'appspace.tests.explode.nothing'),
+            static=True, workers=2,
+        )
+        self.assertEqual(validate(
+            'helpers', ('chain', 'appspace.tests.nothing:thing.attr'),
+        )[0].reason, 'no module appspace.tests.nothing')
+        self.assertEqual(broken[0].namespace, 'helpers')
+        self.assertEqual(
+            broken[0].reason, 'no attribute nothing in appspace.tests.explode',
+        )
+        self.assertNotIn('appspace.tests.explode', sys.modules)
+
+    def test_class_validate(self):
+        from appspace import Patterns, Namespace, Branch, class_validate
+
+        class helpers(Patterns):  # @IgnorePep8
+            square = 'math.sqrt'
+            class subhelpers(Namespace):  # @IgnorePep8
+                boom = 'appspace.tests.explode.thing'
+                broken = 'appspace.tests.explode.nothing'
+            class branched(Branch):  # @IgnorePep8
+                misc = 'appspace.tests.nothing.appconf'
+        broken = class_validate(helpers, static=True)
+        self.assertEqual(
+            sorted((b.namespace, b.label) for b in broken),
+            [('branched', 'misc'), ('subhelpers', 'broken')],
+        )
+        self.assertNotIn('appspace.tests.explode', sys.modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+'''appspace build tracing'''
+
+from operator import attrgetter
+from collections import namedtuple
+from contextlib import contextmanager
+
+from appspace.utils import contextvar
+
+try:
+    from time import perf_counter
+except ImportError:  # pragma: no cover
+    from time import time as perf_counter
+
+__all__ = ('BuildStat', 'BuildTrace', 'traced')
+
+# build time and entries of a configuration class
+BuildStat = namedtuple('BuildStat', 'name kind entries seconds own')
+
+# manager calls counted while tracing
+COUNTED = ('keyed', 'create', 'safename')
+
+# build trace of current execution context
+_active = contextvar('appspace.build')
+
+
+class BuildTrace(object):
+
+    '''
+    opt-in trace of class configuration builds within a with block
+
+    records time and entries per Patterns, Namespace, and Branch class and
+    counts interface checks, key creations, and label normalizations
+    '''
+
+    __slots__ = ('counts', '_stats', '_stack', '_token')
+
+    def __init__(self):
+        self.counts = dict((name, 0) for name in COUNTED)
+        # class -> [kind, entries, seconds, own seconds]
+        self._stats = {}
+        # [class, entries, start time, nested seconds] of running builds
+        self._stack = []
+        self._token = None
+
+    def __enter__(self):
+        self._token = _active.set(self)
+        return self
+
+    def __exit__(self, e, b, c):
+        _active.reset(self._token)
+
+    def counted(self, name, call):
+        '''
+        wrap call made by a build so it is counted
+
+        @param name: count name
+        @param call: manager method
+        '''
+        counts = self.counts
+
+        def counted(*args, **kw):
+            counts[name] += 1
+            return call(*args, **kw)
+        return counted
+
+    def entry(self, call):
+        '''
+        wrap `set` call made by a build so it counts as an entry
+
+        @param call: manager `set` method
+        '''
+        stack, counts = self._stack, self.counts
+
+        def entry(*args, **kw):
+            stack[-1][1] += 1
+            # set normalizes label of every entry
+            counts['safename'] += 1
+            return call(*args, **kw)
+        return entry
+
+    def creating(self, manager):
+        '''
+        wrap `key` call made by a build so new keys are counted
+
+        @param manager: manager being built
+        '''
+        counts, find, key = self.counts, manager._find, manager.key
+
+        def creating(this, label):
+            if find(this, label) is None:
+                counts['create'] += 1
+            return key(this, label)
+        return creating
+
+    def report(self, sort='seconds'):
+        '''
+        build statistics of each class, largest first
+
+        @param sort: BuildStat field to sort by (default: 'seconds')
+        '''
+        stats = [
+            BuildStat(getattr(cls, '__qualname__', cls.__name__), *stat)
+            for cls, stat in self._stats.items()
+        ]
+        return sorted(
+            stats, key=attrgetter(sort), reverse=sort not in ('name', 'kind'),
+        )
+
+
+class _Untraced(object):
+
+    '''call wrappers of builds without an active build trace'''
+
+    __slots__ = ()
+
+    @staticmethod
+    def counted(name, call):
+        return call
+
+    @staticmethod
+    def entry(call):
+        return call
+
+    @staticmethod
+    def creating(manager):
+        return manager.key
+
+
+_untraced = _Untraced()
+
+
+@contextmanager
+def traced(cls, kind, manager):
+    '''
+    trace build of configuration class if a build trace is active
+
+    yields object wrapping the manager calls the build makes so only
+    calls of builds in this execution context are counted
+
+    @param cls: configuration class
+    @param kind: kind of configuration class
+    @param manager: manager being built
+    '''
+    trace = _active.get()
+    if trace is None:
+        yield _untraced
+        return
+    stack = trace._stack
+    frame = [cls, 0, perf_counter(), 0.0]
+    stack.append(frame)
+    try:
+        yield trace
+    finally:
+        stack.pop()
+        seconds = perf_counter() - frame[2]
+        if stack:
+            stack[-1][3] += seconds
+        stat = trace._stats.setdefault(cls, [kind, 0, 0.0, 0.0])
+        stat[1] += frame[1]
+        stat[2] += seconds
+        stat[3] += seconds - frame[3]
@@ -1,35 +1,248 @@
 # -*- coding: utf-8 -*-
 '''appspace utilities'''
 
+import ast
+import sys
+import threading
 from keyword import iskeyword
+from weakref import WeakKeyDictionary
 
 from importlib import import_module
 
 from stuf.six import strings
 
-__all__ = ('checkname', 'lazyimport')
+try:
+    from importlib.util import find_spec
+    from importlib.machinery import PathFinder
+except ImportError:  # pragma: no cover
+    # python < 3.4 can't find modules without importing them
+    find_spec = PathFinder = None
+
+try:
+    from contextvars import ContextVar
+except ImportError:  # pragma: no cover
+    ContextVar = None
+
+__all__ = (
+    'ContextMap', 'checkname', 'checkpath', 'contextvar', 'exports', 'findspec',
+    'lazyimport', 'lazyimports',
+)
+
+# top level names bound by module source files
+_exports = {}
+# import path -> (module name, module, attribute) of things loaded from it
+_imported = {}
+_missing = object()
+# statements whose bodies bind top level names
+_BLOCKS = (ast.If, ast.Try, ast.With) if hasattr(ast, 'Try') else (
+    ast.If, ast.TryExcept, ast.TryFinally, ast.With,
+)
+
+
+def findspec(name):
+    '''
+    find module spec without executing any module
+
+    @param name: module name
+    '''
+    if find_spec is None:  # pragma: no cover
+        return None
+    parent = name.rpartition('.')[0]
+    if parent and parent not in sys.modules:
+        # find_spec would import (and execute) the parent package
+        spec = findspec(parent)
+        if spec is None or spec.submodule_search_locations is None:
+            return None
+        return PathFinder.find_spec(name, spec.submodule_search_locations)
+    try:
+        return find_spec(name)
+    except (ImportError, ValueError):
+        return None
+
+
+def _bound(body, names):
+    for node in body:
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)) or (
+            type(node).__name__ == 'AsyncFunctionDef'
+        ):
+            names.add(node.name)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                if alias.name == '*':
+                    return False
+                names.add(alias.asname or alias.name.partition('.')[0])
+        elif isinstance(node, ast.Assign):
+            for target in node.targets:
+                names.update(
+                    n.id for n in ast.walk(target) if isinstance(n, ast.Name)
+                )
+        elif isinstance(node, (ast.AugAssign, getattr(ast, 'AnnAssign', ()))):
+            if isinstance(node.target, ast.Name):
+                names.add(node.target.id)
+        elif isinstance(node, _BLOCKS):
+            for block in ('body', 'orelse', 'finalbody', 'handlers'):
+                if not _bound(getattr(node, block, ()), names):
+                    return False
+        elif isinstance(node, getattr(ast, 'ExceptHandler', ())):
+            if not _bound(node.body, names):
+                return False
+    return True
+
+
+def exports(spec):
+    '''
+    top level names bound by a module's source without executing it
+
+    returns None if module has no source or binds names dynamically
+
+    @param spec: module spec
+    '''
+    origin = spec.origin
+    if not (spec.has_location and origin and origin.endswith('.py')):
+        return None
+    try:
+        return _exports[origin]
+    except KeyError:
+        with open(origin, 'rb') as source:
+            tree = ast.parse(source.read(), origin)
+        names = set()
+        # star imports and module __getattr__ bind names dynamically
+        if not _bound(tree.body, names) or '__getattr__' in names:
+            names = None
+        _exports[origin] = names
+        return names
+
+
+def _split(path):
+    # module and attribute chain of 'module:attr.chain' import path
+    module, _, chain = path.partition(':')
+    return module, tuple(chain.split('.')) if chain else ()
+
+
+def checkpath(path, static=False):
+    '''
+    check import path without importing it
+
+    returns reason path is broken or None if path looks importable
+
+    @param path: import path ('module.attr' or 'module:attr.chain')
+    @param static: check attribute in module source (default: False)
+    '''
+    if find_spec is None:  # pragma: no cover
+        # unknown without importing
+        return None
+    if ':' in path:
+        module, names = _split(path)
+        attribute = names[0] if names else None
+    elif findspec(path) is not None:
+        return None
+    else:
+        module, _, attribute = path.rpartition('.')
+    spec = findspec(module) if module else None
+    if spec is None:
+        return 'no module {0}'.format(module or path)
+    if static and attribute:
+        try:
+            names = exports(spec)
+        except SyntaxError as e:
+            return 'syntax error in {0}: {1}'.format(module, e)
+        if names is not None and attribute not in names:
+            return 'no attribute {0} in {1}'.format(attribute, module)
+    return None
+
+
+def _attribute(thing, names):
+    # attribute at chain of names on thing
+    for name in names:
+        thing = getattr(thing, name, _missing)
+        if thing is _missing:
+            break
+    return thing
+
+
+def _load(path, module=None):
+    # import path, reusing already imported module of path
+    if ':' in path:
+        # module and attribute chain are explicit
+        parent, names = _split(path)
+        if module is None:
+            module = import_module(parent)
+        thing = _attribute(module, names)
+        if thing is _missing:
+            raise ImportError('no attribute {0} in {1}'.format(
+                '.'.join(names), parent,
+            ))
+        _imported[path] = (parent, module, names)
+        return thing
+    parent, _, name = path.rpartition('.')
+    if parent:
+        if module is None:
+            module = import_module(parent)
+        thing = getattr(module, name, _missing)
+        if thing is not _missing:
+            _imported[path] = (parent, module, (name,))
+            return thing
+    # path is a module
+    thing = import_module(path)
+    _imported[path] = (path, thing, ())
+    return thing
+
+
+def _cached(path):
+    # thing loaded from import path, re-read so patched or reloaded modules
+    # are never stale
+    parent, module, names = _imported[path]
+    if sys.modules.get(parent) is not module:
+        raise KeyError(path)
+    thing = _attribute(module, names)
+    if thing is _missing:
+        raise KeyError(path)
+    return thing
 
 
 def lazyimport(path, attribute=None):
     '''
     deferred module loader
 
-    @param path: something to load
+    @param path: something to load ('module.attr' or 'module:attr.chain')
     @param attribute: attribute on loaded module to return
     '''
     if isinstance(path, strings):
         try:
-            dot = path.rindex('.')
-            # import module
-            path = getattr(import_module(path[:dot]), path[dot + 1:])
-        # If nothing but module name, import the module
-        except (AttributeError, ValueError):
-            path = import_module(path)
+            path = _cached(path)
+        except KeyError:
+            path = _load(path)
         if attribute:
             path = getattr(path, attribute)
     return path
 
 
+def lazyimports(paths):
+    '''
+    load import paths with one import per module
+
+    returns dictionary of import paths and what they load
+
+    @param paths: import paths
+    '''
+    modules = {}
+    for path in paths:
+        modules.setdefault(
+            _split(path)[0] if ':' in path else path.rpartition('.')[0], [],
+        ).append(path)
+    loaded = {}
+    for parent, siblings in modules.items():
+        module = None
+        for path in siblings:
+            try:
+                loaded[path] = _cached(path)
+            except KeyError:
+                if module is None and parent:
+                    module = import_module(parent)
+                loaded[path] = _load(path, module)
+    return loaded
+
+
 class CheckName(object):
 
     '''ensures string is a legal Python name'''
@@ -52,4 +265,84 @@ class CheckName(object):
         return name + '_' if iskeyword(name) else name
 
 
+class LocalVar(threading.local):
+
+    '''thread local stand-in for `contextvars.ContextVar`'''
+
+    def __init__(self, name, default=None):
+        '''
+        init
+
+        @param name: variable name
+        @param default: default value (default: None)
+        '''
+        self.name = name
+        self.value = default
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        token, self.value = self.value, value
+        return token
+
+    def reset(self, token):
+        self.value = token
+
+
+def contextvar(name, default=None):
+    '''
+    context local variable, thread local if `contextvars` is unavailable
+
+    @param name: variable name
+    @param default: default value (default: None)
+    '''
+    if ContextVar is None:  # pragma: no cover
+        return LocalVar(name, default)
+    return ContextVar(name, default=default)
+
+
+class ContextMap(object):
+
+    '''
+    values per object for each execution context, kept in one context
+    variable
+
+    values are copied on write so other contexts never see them change and
+    are weakly keyed so contexts never keep their objects alive
+    '''
+
+    __slots__ = ('_var',)
+
+    def __init__(self, name):
+        '''
+        init
+
+        @param name: variable name
+        '''
+        self._var = contextvar(name)
+
+    def get(self, owner, default=None):
+        '''
+        value of object in this execution context
+
+        @param owner: object value belongs to
+        @param default: value if object has none (default: None)
+        '''
+        values = self._var.get()
+        return default if values is None else values.get(owner, default)
+
+    def set(self, owner, value):
+        '''
+        set value of object in this execution context
+
+        @param owner: object value belongs to
+        @param value: value
+        '''
+        values = self._var.get()
+        values = WeakKeyDictionary() if values is None else values.copy()
+        values[owner] = value
+        self._var.set(values)
+
+
 checkname = CheckName()
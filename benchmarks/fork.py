@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+'''
+shared vs private memory of forked children using an appspace manager
+
+usage: python benchmarks/fork.py [--children N] [--entries N]
+
+Builds a large appconf, forks children that look up every entry, and
+reports the memory each child shares with the parent versus the memory
+private to it (Linux only; reads /proc/<pid>/smaps_rollup), first with a
+cold manager and then after `manager.prepare_for_fork()`.
+'''
+
+import os
+import gc
+import sys
+import json
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from appspace.keys import ANamespace  # @IgnorePep8
+from appspace.managers import Manager  # @IgnorePep8
+
+PATHS = (
+    'math.sqrt', 'math.fabs', 'math.exp', 'math.isinf', 'math.isnan',
+    'operator.add', 'operator.mul', 're.match', 'string.capwords',
+    'os.path.join', 'json.dumps', 'json.loads',
+)
+
+
+def build(entries, namespaces=100):
+    manager = Manager('bench')
+    labels = []
+    with manager.batch():
+        for n in range(namespaces):
+            manager.key(ANamespace, 'ns{0}'.format(n))
+        for i in range(entries):
+            ns = 'ns{0}'.format(i % namespaces)
+            label = 'label{0}'.format(i)
+            manager.set(PATHS[i % len(PATHS)], label, ns)
+            labels.append((label, ns))
+    return manager, labels
+
+
+def memory():
+    # kB of shared and private memory for this process
+    shared = private = 0
+    with open('/proc/self/smaps_rollup') as smaps:
+        for line in smaps:
+            name, _, rest = line.partition(':')
+            if name in ('Shared_Clean', 'Shared_Dirty'):
+                shared += int(rest.split()[0])
+            elif name in ('Private_Clean', 'Private_Dirty'):
+                private += int(rest.split()[0])
+    return shared, private
+
+
+def child(manager, labels, write):
+    get = manager.get
+    for label, ns in labels:
+        get(label, ns)
+    # collections walk and touch every tracked object
+    gc.collect()
+    os.write(write, json.dumps(memory()).encode('ascii') + b'\n')
+    os._exit(0)
+
+
+def run(manager, labels, children):
+    read, write = os.pipe()
+    pids = []
+    for _ in range(children):
+        pid = os.fork()
+        if not pid:
+            os.close(read)
+            child(manager, labels, write)
+        pids.append(pid)
+    os.close(write)
+    with os.fdopen(read) as results:
+        rows = [json.loads(line) for line in results]
+    for pid in pids:
+        os.waitpid(pid, 0)
+    shared = sum(r[0] for r in rows) / float(len(rows))
+    private = sum(r[1] for r in rows) / float(len(rows))
+    return shared, private
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--children', type=int, default=4)
+    parser.add_argument('--entries', type=int, default=50000)
+    options = parser.parse_args()
+    if not os.path.exists('/proc/self/smaps_rollup'):
+        sys.exit('requires Linux /proc/<pid>/smaps_rollup')
+    print('{0:>10} {1:>12} {2:>12} {3:>8}'.format(
+        'mode', 'shared kB', 'private kB', 'shared'
+    ))
+    for mode in ('cold', 'prepared'):
+        manager, labels = build(options.entries)
+        if mode == 'prepared':
+            manager.prepare_for_fork()
+        shared, private = run(manager, labels, options.children)
+        print('{0:>10} {1:>12.0f} {2:>12.0f} {3:>7.0%}'.format(
+            mode, shared, private, shared / (shared + private)
+        ))
+        if hasattr(gc, 'unfreeze'):
+            gc.unfreeze()
+        del manager, labels
+        gc.collect()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+'''
+latency of runtime registrations in a large namespace
+
+usage: python benchmarks/publish.py [--entries N] [--writes N]
+
+Builds one namespace holding N entries (50,000 by default) and times
+single `set` calls outside any batch, first with no label index and then
+after a search has built the index. Publishing a change should cost about
+the same whatever the size of the namespace.
+'''
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from appspace import patterns  # @IgnorePep8
+
+PERCENTILES = (50, 90, 99)
+
+
+def build(entries):
+    plug = patterns('bench')
+    manager = plug.manager
+    with manager.batch():
+        for i in range(entries):
+            manager.set('math.sqrt', 'label{0}'.format(i))
+    return plug
+
+
+def measure(manager, writes):
+    clock = time.perf_counter
+    latencies = []
+    for i in range(writes):
+        label = 'runtime{0}'.format(i)
+        began = clock()
+        manager.set('math.fabs', label)
+        latencies.append(clock() - began)
+        began = clock()
+        manager.unregister_many([label])
+        latencies.append(clock() - began)
+    return sorted(latencies)
+
+
+def report(case, latencies):
+    cells = [
+        latencies[min(len(latencies) - 1, int(len(latencies) * p / 100.0))]
+        for p in PERCENTILES
+    ]
+    print('{0:>10} '.format(case) + ' '.join(
+        '{0:>9.1f}'.format(c * 1e6) for c in cells
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--entries', type=int, default=50000)
+    parser.add_argument('--writes', type=int, default=1000)
+    options = parser.parse_args()
+    plug = build(options.entries)
+    manager = plug.manager
+    print('{0:,} entries, {1:,} writes'.format(options.entries, options.writes))
+    print('{0:>10} '.format('case') + ' '.join(
+        '{0:>9}'.format('p{0}us'.format(p)) for p in PERCENTILES
+    ))
+    report('unindexed', measure(manager, options.writes))
+    manager.prefix('label1')
+    report('indexed', measure(manager, options.writes))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+'''
+multi-threaded contention stress test of a shared appspace
+
+usage: python benchmarks/stress.py [--threads 1,2,4,8] [--seconds N]
+    [--namespaces N] [--labels N] [--writes RATIO] [--seed N]
+    [--free-threaded]
+
+Threads hammer one appspace with a mix of namespace hops
+(`plug[namespace][label]`), dotted path lookups, root lookups, misses,
+first-touch lazy loads, and concurrent `set` calls. Every namespace holds
+the same labels bound to a namespace-specific marker, so a lookup answered
+from the wrong namespace (e.g. a `_current` race) is reported as a
+violation. Reports throughput and latency percentiles per operation for
+each thread count. `--free-threaded` re-runs the harness under a
+free-threaded (python3.13t or newer) interpreter found on PATH.
+'''
+
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import threading
+import sysconfig
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from appspace.keys import ANamespace  # @IgnorePep8
+from appspace import patterns, NoAppError  # @IgnorePep8
+
+OPERATIONS = ('hop', 'path', 'root', 'miss', 'set')
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class Marker(object):
+
+    '''namespace specific component'''
+
+    __slots__ = ('namespace',)
+
+    def __init__(self, namespace):
+        self.namespace = namespace
+
+    def __repr__(self):
+        return 'marker of {0}'.format(self.namespace)
+
+
+def marker(namespace):
+    # import path of namespace marker (created on first use)
+    name = 'MARKER_{0}'.format(namespace)
+    if name not in globals():
+        globals()[name] = Marker(namespace)
+    return '{0}.{1}'.format(__name__, name)
+
+
+def build(namespaces, labels):
+    entries = [('root{0}'.format(i), marker('root')) for i in range(labels)]
+    plug = patterns('stress', *entries)
+    manager = plug.manager
+    with manager.batch():
+        for n in range(namespaces):
+            namespace = 'ns{0}'.format(n)
+            manager.key(ANamespace, namespace)
+            for i in range(labels):
+                manager.set(marker(namespace), 'label{0}'.format(i), namespace)
+    return plug
+
+
+def gil():
+    # whether the global interpreter lock is enabled (python >= 3.13)
+    check = getattr(sys, '_is_gil_enabled', None)
+    return True if check is None else check()
+
+
+def worker(plug, options, seed, start, stop, latencies, violations):
+    manager = plug.manager
+    rand = random.Random(seed)
+    randrange, clock = rand.randrange, time.perf_counter
+    namespaces, labels = options.namespaces, options.labels
+    weights = [(1 - options.writes) / 4.0] * 4 + [options.writes]
+    ops = rand.choices(OPERATIONS, weights, k=4096)
+    records = dict((op, latencies[op]) for op in OPERATIONS)
+    start.wait()
+    n = 0
+    while not stop.is_set():
+        op = ops[n & 4095]
+        n += 1
+        namespace = 'ns{0}'.format(randrange(namespaces))
+        label = 'label{0}'.format(randrange(labels))
+        began = clock()
+        try:
+            if op == 'hop':
+                thing = plug[namespace][label]
+            elif op == 'path':
+                thing = manager.get_path(namespace + '.' + label)
+            elif op == 'root':
+                namespace = 'root'
+                thing = plug['root{0}'.format(randrange(labels))]
+            elif op == 'miss':
+                thing = None
+                try:
+                    plug[namespace]['missing']
+                except NoAppError:
+                    pass
+                else:
+                    violations.append((op, namespace, 'missing found'))
+            else:
+                manager.set(marker(namespace), label, namespace)
+                thing = None
+        except Exception as exc:
+            violations.append((op, namespace, repr(exc)))
+            continue
+        records[op].append(clock() - began)
+        if thing is not None and getattr(thing, 'namespace', None) != (
+            namespace
+        ):
+            violations.append((op, namespace, repr(thing)))
+
+
+def run(options, threads):
+    plug = build(options.namespaces, options.labels)
+    start, stop = threading.Event(), threading.Event()
+    violations = []
+    latencies = [dict((op, array('d')) for op in OPERATIONS) for _ in range(
+        threads
+    )]
+    pool = [
+        threading.Thread(target=worker, args=(
+            plug, options, options.seed + n, start, stop, latencies[n],
+            violations,
+        )) for n in range(threads)
+    ]
+    for thread in pool:
+        thread.start()
+    began = time.perf_counter()
+    start.set()
+    time.sleep(options.seconds)
+    stop.set()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    merged = dict(
+        (op, sorted(t for l in latencies for t in l[op])) for op in OPERATIONS
+    )
+    return merged, elapsed, violations
+
+
+def percentile(ordered, p):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100.0))]
+
+
+def report(threads, merged, elapsed, violations):
+    total = sum(len(v) for v in merged.values())
+    print('\n{0} threads: {1:,.0f} ops/s, {2} violations'.format(
+        threads, total / elapsed, len(violations),
+    ))
+    print('{0:>6} {1:>10} '.format('op', 'ops/s') + ' '.join(
+        '{0:>9}'.format('p{0}us'.format(p)) for p in PERCENTILES + ('max',)
+    ))
+    for op in OPERATIONS:
+        ordered = merged[op]
+        cells = [percentile(ordered, p) for p in PERCENTILES]
+        cells.append(ordered[-1] if ordered else 0.0)
+        print('{0:>6} {1:>10,.0f} '.format(op, len(ordered) / elapsed) + (
+            ' '.join('{0:>9.1f}'.format(c * 1e6) for c in cells)
+        ))
+    for violation in violations[:5]:
+        print('  violation: {0} in {1}: {2}'.format(*violation))
+
+
+def free_threaded():
+    # free-threaded interpreter on PATH
+    for name in ('python3.14t', 'python3.13t'):
+        path = shutil.which(name)
+        if path:
+            return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--threads', default='1,2,4,8')
+    parser.add_argument('--seconds', type=float, default=2.0)
+    parser.add_argument('--namespaces', type=int, default=32)
+    parser.add_argument('--labels', type=int, default=256)
+    parser.add_argument('--writes', type=float, default=0.01)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--free-threaded', action='store_true')
+    options = parser.parse_args()
+    if options.free_threaded and gil():
+        python = free_threaded()
+        if python is None:
+            sys.exit('no free-threaded python (python3.13t) on PATH')
+        argv = [a for a in sys.argv if a != '--free-threaded']
+        os.execv(python, [python, '-X', 'gil=0'] + argv)
+    print('python {0} ({1}build, GIL {2})'.format(
+        sys.version.split()[0],
+        'free-threaded ' if sysconfig.get_config_var('Py_GIL_DISABLED')
+        else '',
+        'enabled' if gil() else 'disabled',
+    ))
+    failed = False
+    for threads in [int(t) for t in options.threads.split(',')]:
+        merged, elapsed, violations = run(options, threads)
+        report(threads, merged, elapsed, violations)
+        failed = failed or bool(violations)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()